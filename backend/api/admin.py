@@ -24,6 +24,7 @@ class CommunityAdmin(admin.ModelAdmin):
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
     list_display = ('nickname', 'steam_id', 'community', 'active', 'created_at')
+    list_select_related = ('community',)
     list_filter = ('active', 'community')
     search_fields = ('nickname', 'steam_id')
     readonly_fields = ('uid', 'created_at', 'updated_at')
@@ -32,6 +33,7 @@ class UserAdmin(admin.ModelAdmin):
 @admin.register(Permission)
 class PermissionAdmin(admin.ModelAdmin):
     list_display = ('user', 'permission', 'created_at')
+    list_select_related = ('user',)
     list_filter = ('permission',)
     search_fields = ('user__nickname', 'permission')
     readonly_fields = ('uid', 'created_at', 'updated_at')
@@ -40,7 +42,9 @@ class PermissionAdmin(admin.ModelAdmin):
 @admin.register(Mission)
 class MissionAdmin(admin.ModelAdmin):
     list_display = ('title', 'slug', 'visibility', 'creator', 'community', 'start_time', 'created_at')
+    list_select_related = ('creator', 'community')
     list_filter = ('visibility', 'community', 'start_time')
+    # Plain substring search, served by the trigram indexes on Mission
     search_fields = ('title', 'slug', 'description')
     readonly_fields = ('uid', 'created_at', 'updated_at')
 
@@ -48,6 +52,7 @@ class MissionAdmin(admin.ModelAdmin):
 @admin.register(MissionSlotGroup)
 class MissionSlotGroupAdmin(admin.ModelAdmin):
     list_display = ('title', 'mission', 'order_number', 'created_at')
+    list_select_related = ('mission',)
     list_filter = ('mission',)
     search_fields = ('title', 'mission__title')
     readonly_fields = ('uid', 'created_at', 'updated_at')
@@ -57,6 +62,7 @@ class MissionSlotGroupAdmin(admin.ModelAdmin):
 @admin.register(MissionSlot)
 class MissionSlotAdmin(admin.ModelAdmin):
     list_display = ('title', 'slot_group', 'assignee', 'blocked', 'reserve', 'order_number')
+    list_select_related = ('slot_group', 'assignee')
     list_filter = ('blocked', 'reserve', 'auto_assignable', 'restricted_community')
     search_fields = ('title', 'slot_group__title', 'assignee__nickname')
     readonly_fields = ('uid', 'created_at', 'updated_at')
@@ -66,6 +72,7 @@ class MissionSlotAdmin(admin.ModelAdmin):
 @admin.register(MissionSlotRegistration)
 class MissionSlotRegistrationAdmin(admin.ModelAdmin):
     list_display = ('user', 'slot', 'created_at')
+    list_select_related = ('user', 'slot__slot_group')
     search_fields = ('user__nickname', 'slot__title')
     readonly_fields = ('uid', 'created_at', 'updated_at')
 
@@ -73,6 +80,7 @@ class MissionSlotRegistrationAdmin(admin.ModelAdmin):
 @admin.register(MissionSlotTemplate)
 class MissionSlotTemplateAdmin(admin.ModelAdmin):
     list_display = ('title', 'creator', 'community', 'created_at')
+    list_select_related = ('creator', 'community')
     list_filter = ('community',)
     search_fields = ('title', 'creator__nickname')
     readonly_fields = ('uid', 'created_at', 'updated_at')
@@ -81,6 +89,7 @@ class MissionSlotTemplateAdmin(admin.ModelAdmin):
 @admin.register(MissionAccess)
 class MissionAccessAdmin(admin.ModelAdmin):
     list_display = ('mission', 'user', 'community', 'created_at')
+    list_select_related = ('mission', 'user', 'community')
     list_filter = ('mission', 'community')
     search_fields = ('mission__title', 'user__nickname', 'community__name')
     readonly_fields = ('uid', 'created_at', 'updated_at')
@@ -89,6 +98,7 @@ class MissionAccessAdmin(admin.ModelAdmin):
 @admin.register(CommunityApplication)
 class CommunityApplicationAdmin(admin.ModelAdmin):
     list_display = ('user', 'community', 'status', 'created_at')
+    list_select_related = ('user', 'community')
     list_filter = ('status', 'community')
     search_fields = ('user__nickname', 'community__name')
     readonly_fields = ('uid', 'created_at', 'updated_at')
@@ -97,6 +107,7 @@ class CommunityApplicationAdmin(admin.ModelAdmin):
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ('user', 'notification_type', 'title', 'read', 'created_at')
+    list_select_related = ('user',)
     list_filter = ('read', 'notification_type')
     search_fields = ('user__nickname', 'title', 'message')
     readonly_fields = ('uid', 'created_at', 'updated_at')
@@ -1,24 +1,47 @@
 from ninja import NinjaAPI
-import api.routers.auth as auth
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+
+
+class SlotlistAPI(NinjaAPI):
+    """NinjaAPI that builds the OpenAPI schema once per path prefix instead of on every request"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._openapi_schemas = {}
+    
+    def get_openapi_schema(self, *, path_prefix=None, path_params=None):
+        if path_prefix is None:
+            path_prefix = self.get_root_path(path_params or {})
+        # Routers are all registered at import time, so the schema can't change afterwards
+        if path_prefix not in self._openapi_schemas:
+            self._openapi_schemas[path_prefix] = super().get_openapi_schema(path_prefix=path_prefix)
+        return self._openapi_schemas[path_prefix]
 
 
 # Create API instance
-api = NinjaAPI(
+api = SlotlistAPI(
     title='slotlist.online API',
     version='2.0.0',
     description='Backend API for slotlist.online - ArmA 3 mission planning and slotlist management',
-    auth=auth.JWTAuth()
+    renderer=ORJSONRenderer(),
+    parser=ORJSONParser()
 )
 
 # Import routers after API is created to avoid circular imports
 from api.routers import auth, mission, user, community, status, notification, mission_slot_template, mission_import
 
+# There is no API-wide auth, so public routers (auth, status) skip the bearer check entirely;
+# protected routers opt in with the shared JWTAuth instance and their public operations
+# keep their own auth=None
+_JWT_AUTH = auth.jwt_auth
+
 # Register routers
-api.add_router('/v1/auth/', auth.router, tags=['Authentication'], auth=None)
-api.add_router('/v1/missions/', mission.router, tags=['Missions'])
-api.add_router('/v1/missionSlotTemplates/', mission_slot_template.router, tags=['Mission Slot Templates'])
-api.add_router('/v1/', mission_import.router, tags=['Mission Import'])
-api.add_router('/v1/users/', user.router, tags=['Users'])
-api.add_router('/v1/communities/', community.router, tags=['Communities'])
-api.add_router('/v1/notifications/', notification.router, tags=['Notifications'])
+api.add_router('/v1/auth/', auth.router, tags=['Authentication'])
+api.add_router('/v1/missions/', mission.router, tags=['Missions'], auth=_JWT_AUTH)
+api.add_router('/v1/missionSlotTemplates/', mission_slot_template.router, tags=['Mission Slot Templates'], auth=_JWT_AUTH)
+api.add_router('/v1/', mission_import.router, tags=['Mission Import'], auth=_JWT_AUTH)
+api.add_router('/v1/users/', user.router, tags=['Users'], auth=_JWT_AUTH)
+api.add_router('/v1/communities/', community.router, tags=['Communities'], auth=_JWT_AUTH)
+api.add_router('/v1/notifications/', notification.router, tags=['Notifications'], auth=_JWT_AUTH)
 api.add_router('/v1/', status.router, tags=['Status'])
@@ -1,22 +1,42 @@
+import hashlib
+import time
 import jwt
-from datetime import datetime, timedelta
+import orjson
 from django.conf import settings
 from django.contrib.auth.models import User as DjangoUser
 from typing import Optional, Dict, Any
-from api.models import User, Permission
+from api.models import User
+
+
+# Bit positions of the global permissions checked on hot paths. Tokens carry a
+# 'perm_bitmap' claim built from these, so positions must never be reused or reordered;
+# only append new entries.
+PERMISSION_BITS = {
+    'admin.community': 1 << 0,
+    'admin.mission': 1 << 1,
+    'admin.permission': 1 << 2,
+    'admin.slotTemplate': 1 << 3,
+    'admin.user': 1 << 4,
+}
+
+# Signs tokens from pre-serialized payloads, skipping PyJWT's claim conversion and json.dumps
+_jws = jwt.PyJWS()
 
 
 def generate_jwt(user: User) -> str:
     """Generate a JWT token for a user"""
     from api.models import Mission
     
-    permissions = list(Permission.objects.filter(user=user).values_list('permission', flat=True))
+    # Goes through the related manager so callers can prefetch 'permissions'
+    permissions = [perm.permission for perm in user.permissions.all()]
     
     # Add dynamic creator permissions for missions created by this user
     created_missions = Mission.objects.filter(creator=user).values_list('slug', flat=True)
     for mission_slug in created_missions:
         permissions.append(f'mission.{mission_slug}.creator')
     
+    # NumericDate claims; jwt.encode would convert datetimes to exactly these
+    issued_at = int(time.time())
     payload = {
         'user': {
             'uid': str(user.uid),
@@ -31,15 +51,16 @@ def generate_jwt(user: User) -> str:
             'active': user.active
         },
         'permissions': permissions,
-        'iat': datetime.utcnow(),
-        'exp': datetime.utcnow() + timedelta(seconds=settings.JWT_EXPIRES_IN),
+        'perm_bitmap': permission_bitmap(permissions),
+        'iat': issued_at,
+        'exp': issued_at + settings.JWT_EXPIRES_IN,
         'iss': settings.JWT_ISSUER,
         'aud': settings.JWT_AUDIENCE,
         'sub': str(user.uid)
     }
     
-    token = jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
-    return token
+    # The payload only holds JSON types, so serialize it with orjson and sign the bytes directly
+    return _jws.encode(orjson.dumps(payload), settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
 
 def get_or_create_user_from_django_user(django_user: DjangoUser) -> User:
@@ -81,6 +102,66 @@ def decode_jwt(token: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+# Decoded tokens are remembered for at most this many seconds (and never past their 'exp')
+JWT_CACHE_MAX_TTL = 300
+# Upper bound on remembered tokens per process; expired entries are purged when it is hit
+JWT_CACHE_MAX_SIZE = 10000
+
+# sha256(token) -> (payload, expires_at)
+_jwt_cache: Dict[bytes, tuple] = {}
+
+
+def decode_jwt_cached(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Decode and verify a JWT token, remembering the result per process.
+    
+    Repeated requests with the same token are answered with a dict lookup instead of
+    signature verification and JSON parsing. Entries expire with the token itself and
+    after JWT_CACHE_MAX_TTL at the latest, so settings changes are picked up quickly.
+    Invalid tokens are not cached.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.time()
+    
+    entry = _jwt_cache.get(key)
+    if entry is not None:
+        if entry[1] > now:
+            return entry[0]
+        _jwt_cache.pop(key, None)
+    
+    payload = decode_jwt(token)
+    if payload is None:
+        return None
+    
+    if len(_jwt_cache) >= JWT_CACHE_MAX_SIZE:
+        _purge_jwt_cache(now)
+    _jwt_cache[key] = (payload, min(payload.get('exp', now), now + JWT_CACHE_MAX_TTL))
+    return payload
+
+
+def revoke_cached_tokens(user_uid) -> None:
+    """
+    Forget all tokens of a user cached by this process, e.g. after the account was deleted or deactivated.
+    
+    The next request with one of their tokens that hits this process goes through full
+    verification again. Other worker processes have their own caches and may keep
+    accepting the token for up to JWT_CACHE_MAX_TTL seconds.
+    """
+    user_uid = str(user_uid)
+    for key, (payload, _) in list(_jwt_cache.items()):
+        if payload.get('sub') == user_uid:
+            _jwt_cache.pop(key, None)
+
+
+def _purge_jwt_cache(now: float) -> None:
+    """Drop expired entries from the token cache, or everything if none have expired"""
+    expired = [key for key, (_, expires_at) in list(_jwt_cache.items()) if expires_at <= now]
+    if not expired:
+        _jwt_cache.clear()
+    for key in expired:
+        _jwt_cache.pop(key, None)
+
+
 def parse_permissions(permissions: list) -> dict:
     """
     Parse a list of permissions into a nested dictionary/tree structure.
@@ -161,8 +242,77 @@ def has_permission(permissions: list, target_permissions: str or list) -> bool:
         return False
     
     # Parse permissions into tree structure
-    parsed_permissions = parse_permissions(permissions)
+    return _has_parsed_permission(parse_permissions(permissions), target_permissions)
+
+
+def request_has_permission(request, target_permissions: str or list) -> bool:
+    """
+    Check if the authenticated user of a request has the required permission(s).
+    Same semantics as has_permission, but exact grants are answered from a frozenset
+    and the parsed permission tree and every other decision are cached on the request
+    so repeated checks don't re-scan the list.
     
+    Args:
+        request: Request with the decoded JWT payload in request.auth
+        target_permissions: Permission(s) to check for (string or list of strings)
+    
+    Returns:
+        bool: Whether the user has at least one of the target permissions
+    """
+    auth = getattr(request, 'auth', None)
+    if not auth or not auth.get('permissions'):
+        return False
+    
+    # Tokens issued with a permission bitmap answer the common checks with a single AND
+    bitmap = auth.get('perm_bitmap')
+    if bitmap is not None and isinstance(target_permissions, str) and target_permissions in PERMISSION_BITS:
+        return bool(bitmap & PERMISSION_BITS[target_permissions])
+    
+    perm_set = getattr(request, '_perm_set', None)
+    if perm_set is None:
+        perm_set = request._perm_set = frozenset(auth['permissions'])
+        request._permission_cache = {}
+    
+    # A permission the user holds verbatim always matches, no tree walk needed
+    targets = target_permissions if isinstance(target_permissions, list) else (target_permissions,)
+    if not perm_set.isdisjoint(targets):
+        return True
+    
+    # Everything else (wildcards, superadmin, prefixes, case) goes through the permission tree
+    cache = request._permission_cache
+    key = tuple(targets)
+    if key not in cache:
+        tree = cache.get(None)
+        if tree is None:
+            tree = cache[None] = parse_permissions(auth['permissions'])
+        cache[key] = _has_parsed_permission(tree, target_permissions)
+    return cache[key]
+
+
+def permission_bitmap(permissions: list) -> int:
+    """
+    Encode which of the PERMISSION_BITS a permission list grants.
+    Wildcards and admin.superadmin are resolved here, at token issue time.
+    
+    Args:
+        permissions: List of permission strings the user has
+    
+    Returns:
+        int: Bitmap with the bits of all granted PERMISSION_BITS set
+    """
+    if not permissions:
+        return 0
+    
+    parsed_permissions = parse_permissions(permissions)
+    bitmap = 0
+    for permission, bit in PERMISSION_BITS.items():
+        if _has_parsed_permission(parsed_permissions, permission):
+            bitmap |= bit
+    return bitmap
+
+
+def _has_parsed_permission(parsed_permissions: dict, target_permissions: str or list) -> bool:
+    """Check target permission(s) against an already parsed permission tree"""
     # Check for global admin permissions
     if '*' in parsed_permissions or find_permission(parsed_permissions, 'admin.superadmin'):
         return True
@@ -0,0 +1,44 @@
+"""
+Helpers for HTTP conditional requests (ETag / Last-Modified) in API views.
+"""
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+
+def make_etag(*parts) -> str:
+    """Build a quoted strong ETag from the values that determine a response's content"""
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return quote_etag(digest)
+
+
+def conditional_response(
+    request: HttpRequest,
+    response: HttpResponse,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> Optional[HttpResponse]:
+    """
+    Stamp validators on the view's response and evaluate the request's conditional headers.
+    
+    Args:
+        request: Incoming request
+        response: Temporal response of the Ninja view, receives the ETag/Last-Modified headers
+        etag: Quoted ETag of the current representation, see make_etag()
+        last_modified: Last modification time of the current representation
+    
+    Returns:
+        HttpResponse: 304/412 response to return instead of rendering, or None to render normally
+    """
+    response.headers['ETag'] = etag
+    timestamp = None
+    if last_modified is not None:
+        timestamp = int(last_modified.timestamp())
+        response.headers['Last-Modified'] = http_date(timestamp)
+    
+    conditional = get_conditional_response(request, etag=etag, last_modified=timestamp, response=response)
+    return None if conditional is response else conditional
@@ -8,11 +8,16 @@ import requests
 from typing import Dict, Any, Optional, Tuple
 from django.db import transaction
 from api.models import (
-    Mission, MissionSlotGroup, MissionSlot,
+    Mission, MissionSlotGroup, MissionSlot, MissionSlotRegistration,
     Community, User
 )
 
 
+# One session for all slotlist.info requests, so the slots fetch reuses the mission fetch's
+# keep-alive connection instead of doing a second TCP + TLS handshake
+_session = requests.Session()
+
+
 class MissionImportError(Exception):
     """Base exception for mission import errors"""
     pass
@@ -50,11 +55,11 @@ def fetch_mission_data(slug: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     slots_url = f'https://api.slotlist.info/v1/missions/{slug}/slots'
     
     try:
-        mission_response = requests.get(mission_url, timeout=30)
+        mission_response = _session.get(mission_url, timeout=30)
         mission_response.raise_for_status()
         mission_data = mission_response.json()['mission']
         
-        slots_response = requests.get(slots_url, timeout=30)
+        slots_response = _session.get(slots_url, timeout=30)
         slots_response.raise_for_status()
         slots_data = slots_response.json()['slotGroups']
         
@@ -63,6 +68,23 @@ def fetch_mission_data(slug: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         raise APIFetchError(f'Failed to fetch mission data: {e}')
 
 
+def ensure_mission_not_imported(slug: str) -> None:
+    """
+    Check that no mission with the given slug exists yet.
+    
+    Called before fetching from slotlist.info so that repeated imports fail
+    immediately instead of waiting on the external API first.
+    
+    Args:
+        slug: Mission slug
+        
+    Raises:
+        MissionAlreadyExistsError: If mission with slug already exists
+    """
+    if Mission.objects.filter(slug=slug).exists():
+        raise MissionAlreadyExistsError(f'Mission with slug {slug} already exists')
+
+
 def get_or_create_community(community_data: Dict[str, Any]) -> Community:
     """
     Get or create community from API data.
@@ -116,7 +138,7 @@ def get_or_create_user(user_data: Dict[str, Any]) -> Optional[User]:
     # Update community for existing users if it's different
     if not created and user_community and user.community != user_community:
         user.community = user_community
-        user.save(update_fields=['community'])
+        user.save(update_fields=['community', 'updated_at'])
     
     return user
 
@@ -167,8 +189,7 @@ def import_mission(
             raise CreatorNotFoundError('Could not determine mission creator from API data')
     
     # Check if mission already exists
-    if Mission.objects.filter(slug=mission_data['slug']).exists():
-        raise MissionAlreadyExistsError(f'Mission with slug {mission_data["slug"]} already exists')
+    ensure_mission_not_imported(mission_data['slug'])
     
     # Import in transaction
     with transaction.atomic():
@@ -209,36 +230,53 @@ def _import_slots(mission: Mission, slot_groups_data: list) -> None:
     """
     Import slot groups and slots for a mission.
     
+    Groups, slots and registrations are each inserted with a single bulk_create.
+    Their UIDs come from the API data, so rows can reference each other before
+    they are saved.
+    
     Args:
         mission: Mission instance to add slots to
         slot_groups_data: List of slot group data from API
     """
+    slot_groups = []
+    slots = []
+    registrations = []
+    
+    # Communities and users repeat across slots; resolve each one only once
+    communities = {}
+    users = {}
+    
     for group_data in slot_groups_data:
         # Create slot group
-        slot_group = MissionSlotGroup.objects.create(
+        slot_group = MissionSlotGroup(
             uid=group_data['uid'],
             mission=mission,
             title=group_data['title'],
             description=group_data.get('description'),
             order_number=group_data['orderNumber'],
         )
+        slot_groups.append(slot_group)
         
         # Create slots
         for slot_data in group_data['slots']:
             # Get restricted community if any
             restricted_community = None
-            if slot_data.get('restrictedCommunity'):
-                restricted_community = get_or_create_community(
-                    slot_data['restrictedCommunity']
-                )
+            community_data = slot_data.get('restrictedCommunity')
+            if community_data:
+                if community_data['uid'] not in communities:
+                    communities[community_data['uid']] = get_or_create_community(community_data)
+                restricted_community = communities[community_data['uid']]
             
             # Get assignee if any
             assignee = None
-            if slot_data.get('assignee'):
-                assignee = get_or_create_user(slot_data['assignee'])
+            assignee_data = slot_data.get('assignee')
+            if assignee_data:
+                if assignee_data['uid'] not in users:
+                    users[assignee_data['uid']] = get_or_create_user(assignee_data)
+                assignee = users[assignee_data['uid']]
             
             # Create slot
-            slot = MissionSlot.objects.create(
+            slot = MissionSlot(
                 uid=slot_data['uid'],
                 slot_group=slot_group,
                 title=slot_data['title'],
@@ -253,15 +291,19 @@ def _import_slots(mission: Mission, slot_groups_data: list) -> None:
                 reserve=slot_data.get('reserve', False),
                 auto_assignable=slot_data.get('autoAssignable', True),
             )
+            slots.append(slot)
             
             # Create registration if there's an assignee
             if assignee and slot_data.get('registrationUid'):
-                from api.models import MissionSlotRegistration
-                MissionSlotRegistration.objects.create(
+                registrations.append(MissionSlotRegistration(
                     uid=slot_data['registrationUid'],
                     user=assignee,
                     slot=slot,
-                )
+                ))
+    
+    MissionSlotGroup.objects.bulk_create(slot_groups)
+    MissionSlot.objects.bulk_create(slots, batch_size=500)
+    MissionSlotRegistration.objects.bulk_create(registrations, batch_size=500)
 
 
 def preview_import(mission_data: Dict[str, Any], slots_data: list) -> Dict[str, Any]:
@@ -275,7 +317,23 @@ def preview_import(mission_data: Dict[str, Any], slots_data: list) -> Dict[str,
     Returns:
         Dictionary with preview information
     """
-    preview = {
+    slot_groups = []
+    slot_total = 0
+    
+    # Build group previews and totals in a single pass over the slot data
+    for group in slots_data:
+        slots = [
+            {'title': slot['title'], 'assignee': _preview_assignee(slot)}
+            for slot in group['slots']
+        ]
+        slot_total += len(slots)
+        slot_groups.append({
+            'title': group['title'],
+            'slot_count': len(slots),
+            'slots': slots
+        })
+    
+    return {
         'mission': {
             'title': mission_data['title'],
             'slug': mission_data['slug'],
@@ -286,33 +344,18 @@ def preview_import(mission_data: Dict[str, Any], slots_data: list) -> Dict[str,
                 'slug': mission_data['community']['slug'],
             },
         },
-        'slot_groups': [],
+        'slot_groups': slot_groups,
         'totals': {
-            'slot_groups': len(slots_data),
-            'slots': sum(len(group['slots']) for group in slots_data),
+            'slot_groups': len(slot_groups),
+            'slots': slot_total,
         }
     }
-    
-    for group in slots_data:
-        slots = []
-        for slot in group['slots']:
-            slot_info = {'title': slot['title']}
-            
-            # Add assignee info if present
-            if slot.get('assignee'):
-                slot_info['assignee'] = slot['assignee']['nickname']
-            elif slot.get('externalAssignee'):
-                slot_info['assignee'] = f"External: {slot['externalAssignee']}"
-            else:
-                slot_info['assignee'] = 'Unassigned'
-            
-            slots.append(slot_info)
-        
-        group_preview = {
-            'title': group['title'],
-            'slot_count': len(group['slots']),
-            'slots': slots
-        }
-        preview['slot_groups'].append(group_preview)
-    
-    return preview
+
+
+def _preview_assignee(slot: Dict[str, Any]) -> str:
+    """Describe who a slot is assigned to for the import preview"""
+    if slot.get('assignee'):
+        return slot['assignee']['nickname']
+    if slot.get('externalAssignee'):
+        return f"External: {slot['externalAssignee']}"
+    return 'Unassigned'
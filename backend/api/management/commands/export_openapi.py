@@ -0,0 +1,35 @@
+import json
+from django.core.management.base import BaseCommand
+from ninja.responses import NinjaJSONEncoder
+from api.api import api
+
+
+class Command(BaseCommand):
+    help = 'Export the OpenAPI schema of the API as JSON (e.g. for client generation or static hosting)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            type=str,
+            required=False,
+            help='File to write the schema to (default: stdout)',
+        )
+        parser.add_argument(
+            '--path-prefix',
+            type=str,
+            default='/api/',
+            help='Path prefix the API is mounted under (default: /api/)',
+        )
+
+    def handle(self, *args, **options):
+        schema = api.get_openapi_schema(path_prefix=options['path_prefix'])
+        content = json.dumps(schema, cls=NinjaJSONEncoder, indent=2)
+        
+        output = options.get('output')
+        if not output:
+            self.stdout.write(content)
+            return
+        
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(content + '\n')
+        self.stdout.write(self.style.SUCCESS(f'Wrote OpenAPI schema to {output}'))
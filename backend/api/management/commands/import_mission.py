@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand, CommandError
 from api.import_utils import (
+    ensure_mission_not_imported,
     fetch_mission_data,
     import_mission,
     preview_import,
@@ -33,6 +34,12 @@ class Command(BaseCommand):
 
         self.stdout.write(f'Importing mission: {slug}')
         
+        if not dry_run:
+            try:
+                ensure_mission_not_imported(slug)
+            except MissionAlreadyExistsError as e:
+                raise CommandError(str(e))
+        
         # Fetch mission data
         try:
             self.stdout.write(f'Fetching mission from https://api.slotlist.info/v1/missions/{slug}')
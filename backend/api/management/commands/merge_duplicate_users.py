@@ -136,7 +136,7 @@ class Command(BaseCommand):
                 # Transfer community if target doesn't have one but imported user does
                 if imported_user.community and not target_user.community:
                     target_user.community = imported_user.community
-                    target_user.save(update_fields=['community'])
+                    target_user.save(update_fields=['community', 'updated_at'])
                     self.stdout.write(
                         f'    Transferred community: {imported_user.community.name} ({imported_user.community.slug})'
                     )
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-16 03:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0002_alter_mission_required_dlcs_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["user", "read", "-created_at"],
+                name="notif_user_read_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-16 03:24
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+from django.db.models.functions import Cast, Upper
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0003_notification_user_read_created_idx"),
+    ]
+
+    operations = [
+        # CREATE EXTENSION needs superuser rights before PostgreSQL 13, and CREATE on the
+        # database for trusted extensions like pg_trgm from 13 on. Nothing is run if the
+        # extension exists already, so a superuser can pre-create it for a restricted app role.
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="mission",
+            index=GinIndex(
+                OpClass(Upper(Cast("title", models.TextField())), name="gin_trgm_ops"),
+                name="mission_title_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mission",
+            index=GinIndex(
+                OpClass(Upper(Cast("slug", models.TextField())), name="gin_trgm_ops"),
+                name="mission_slug_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mission",
+            index=GinIndex(
+                OpClass(Upper(Cast("description", models.TextField())), name="gin_trgm_ops"),
+                name="mission_desc_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=GinIndex(
+                OpClass(Upper(Cast("nickname", models.TextField())), name="gin_trgm_ops"),
+                name="user_nickname_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=GinIndex(
+                OpClass(Upper(Cast("steam_id", models.TextField())), name="gin_trgm_ops"),
+                name="user_steam_id_trgm_idx",
+            ),
+        ),
+    ]
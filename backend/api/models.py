@@ -1,5 +1,7 @@
 import uuid
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Cast, Upper
 
 
 # Note: All models have `managed = True` in their Meta class.
@@ -8,6 +10,17 @@ from django.db import models
 # original TypeScript/Sequelize backend using db_column mappings for compatibility.
 
 
+def trigram_search_index(field: str, name: str) -> GinIndex:
+    """
+    GIN trigram index for case-insensitive substring search on a column.
+    
+    icontains (and so admin search_fields) compiles to UPPER(col::text) LIKE UPPER('%q%'),
+    which a plain btree can't serve; the index is built on that exact expression.
+    Requires the pg_trgm extension.
+    """
+    return GinIndex(OpClass(Upper(Cast(field, models.TextField())), name='gin_trgm_ops'), name=name)
+
+
 class ArmaThreeDLC(models.TextChoices):
     """
     ArmA 3 DLC options.
@@ -106,6 +119,10 @@ class User(models.Model):
     class Meta:
         db_table = 'users'
         managed = True
+        indexes = [
+            trigram_search_index('nickname', 'user_nickname_trgm_idx'),
+            trigram_search_index('steam_id', 'user_steam_id_trgm_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nickname} ({self.steam_id})"
@@ -214,6 +231,11 @@ class Mission(models.Model):
     class Meta:
         db_table = 'missions'
         managed = True
+        indexes = [
+            trigram_search_index('title', 'mission_title_trgm_idx'),
+            trigram_search_index('slug', 'mission_slug_trgm_idx'),
+            trigram_search_index('description', 'mission_desc_trgm_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -425,6 +447,11 @@ class Notification(models.Model):
         db_table = 'notifications'
         ordering = ['-created_at']
         managed = True
+        indexes = [
+            # No INCLUDE (title, message): the list also renders additional_data, so it reads the
+            # heap regardless, and an unbounded message would push entries past the btree row limit
+            models.Index(fields=['user', 'read', '-created_at'], name='notif_user_read_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.nickname}: {self.notification_type}"
@@ -0,0 +1,73 @@
+"""
+Helpers for building querysets that match what a response schema renders.
+"""
+from functools import lru_cache
+from typing import Tuple, Type, get_args
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, QuerySet
+from pydantic import BaseModel
+
+
+def apply_prefetch(queryset: QuerySet, schema: Type[BaseModel]) -> QuerySet:
+    """
+    Add select_related/prefetch_related for every relation rendered by a response schema.
+    
+    Nested schemas on forward foreign keys are joined via select_related, List[...] schemas
+    on reverse or many-to-many relations are loaded via prefetch_related. Relations the
+    schema doesn't render are left alone, so views can't drift into loading dead data.
+    
+    Args:
+        queryset: Base queryset for the schema's model
+        schema: Response schema the queryset results will be rendered with
+    
+    Returns:
+        QuerySet: The queryset with the required related lookups applied
+    """
+    select, prefetch = _schema_relations(schema, queryset.model)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+@lru_cache(maxsize=None)
+def _schema_relations(schema: Type[BaseModel], model: Type[Model], prefix: str = '') -> Tuple[tuple, tuple]:
+    """Collect (select_related, prefetch_related) lookups for a schema/model pair"""
+    select, prefetch = [], []
+    
+    for name, field in schema.model_fields.items():
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation:
+            continue
+        
+        nested = _nested_schema(field.annotation)
+        if nested is None:
+            continue
+        
+        lookup = f'{prefix}{name}'
+        if model_field.many_to_one or (model_field.one_to_one and model_field.concrete):
+            select.append(lookup)
+            nested_select, nested_prefetch = _schema_relations(nested, model_field.related_model, f'{lookup}__')
+            select.extend(nested_select)
+            prefetch.extend(nested_prefetch)
+        else:
+            # Nested lookups of a prefetched relation are resolved by the prefetch itself
+            prefetch.append(lookup)
+    
+    return tuple(select), tuple(prefetch)
+
+
+def _nested_schema(annotation):
+    """Return the schema class wrapped in an annotation like Optional[X] or List[X], if any"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        nested = _nested_schema(arg)
+        if nested is not None:
+            return nested
+    return None
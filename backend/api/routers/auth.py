@@ -4,11 +4,12 @@ from django.shortcuts import get_object_or_404
 from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User as DjangoUser
+from django.db.models import Prefetch
 from django.http import HttpRequest
 from typing import Optional
-from api.models import User
+from api.models import User, Permission
 from api.schemas import AuthResponseSchema, UserSchema, ErrorResponseSchema
-from api.auth import generate_jwt, get_or_create_user_from_django_user, decode_jwt
+from api.auth import generate_jwt, get_or_create_user_from_django_user, decode_jwt_cached
 from api.steam_auth import steam_service
 from pydantic import BaseModel
 
@@ -41,8 +42,8 @@ class JWTAuth(HttpBearer):
         """
         Authenticate the request using JWT token.
         """
-        # Decode and verify the token
-        payload = decode_jwt(token)
+        # Decode and verify the token (repeated tokens are served from the per-process cache)
+        payload = decode_jwt_cached(token)
         if payload:
             return payload
         
@@ -50,8 +51,14 @@ class JWTAuth(HttpBearer):
         return None
 
 
+# Shared by every operation and router that requires a token
+jwt_auth = JWTAuth()
+
 router = Router()
 
+# User columns the token and account responses render; the timestamps are never needed here
+_ACCOUNT_FIELDS = ('uid', 'nickname', 'steam_id', 'active', 'community')
+
 
 class DevLoginSchema(BaseModel):
     nickname: str
@@ -153,7 +160,7 @@ def verify_steam_login(request, payload: SteamLoginSchema):
     
     # Get or create user
     try:
-        user = User.objects.get(steam_id=steam_id)
+        user = User.objects.only(*_ACCOUNT_FIELDS).select_related('community').get(steam_id=steam_id)
         print(f"Found existing user: {user.nickname} ({user.uid})")
         
         # Check if user is active
@@ -343,7 +350,7 @@ def django_login(request, credentials: DjangoLoginSchema):
     }
 
 
-@router.post('/refresh', response=AuthResponseSchema, auth=JWTAuth())
+@router.post('/refresh', response=AuthResponseSchema, auth=jwt_auth)
 def refresh_token(request):
     """
     Refresh JWT token
@@ -378,8 +385,13 @@ def refresh_token(request):
     if not user_data:
         return 401, {'detail': 'Invalid token'}
     
-    
-    user = get_object_or_404(User, uid=user_data['uid'])
+    # Community and permissions are both needed for the new token; load them up front
+    user = get_object_or_404(
+        User.objects.only(*_ACCOUNT_FIELDS).select_related('community').prefetch_related(
+            Prefetch('permissions', queryset=Permission.objects.only('uid', 'permission', 'user_id'))
+        ),
+        uid=user_data['uid']
+    )
     
     if not user.active:
         return 403, {'detail': 'User account is deactivated'}
@@ -398,7 +410,7 @@ def refresh_token(request):
     }
 
 
-@router.get('/account', auth=JWTAuth())
+@router.get('/account', auth=jwt_auth)
 def get_account_details(request):
     """
     Get authenticated user's account details
@@ -437,7 +449,7 @@ def get_account_details(request):
     if not user_data:
         return 401, {'detail': 'Invalid token'}
     
-    user = get_object_or_404(User.objects.select_related('community'), uid=user_data['uid'])
+    user = get_object_or_404(User.objects.only(*_ACCOUNT_FIELDS).select_related('community'), uid=user_data['uid'])
     
     if not user.active:
         return 403, {'detail': 'User account is deactivated'}
@@ -458,7 +470,7 @@ def get_account_details(request):
     }
 
 
-@router.patch('/account', auth=JWTAuth())
+@router.patch('/account', auth=jwt_auth)
 def update_account(request, payload: dict):
     """
     Update authenticated user's account details
@@ -481,7 +493,7 @@ def update_account(request, payload: dict):
     if not user_data:
         return 401, {'detail': 'Invalid token'}
     
-    user = get_object_or_404(User.objects.select_related('community'), uid=user_data['uid'])
+    user = get_object_or_404(User.objects.only(*_ACCOUNT_FIELDS).select_related('community'), uid=user_data['uid'])
     
     if not user.active:
         return 403, {'detail': 'User account is deactivated'}
@@ -489,7 +501,7 @@ def update_account(request, payload: dict):
     # Update nickname if provided
     if 'nickname' in payload:
         user.nickname = payload['nickname']
-        user.save()
+        user.save(update_fields=['nickname', 'updated_at'])
     
     return {
         'user': {
@@ -507,7 +519,7 @@ def update_account(request, payload: dict):
     }
 
 
-@router.post('/account/delete', auth=JWTAuth())
+@router.post('/account/delete', auth=jwt_auth)
 def delete_account(request, payload: dict):
     """
     Delete authenticated user's account
@@ -521,6 +533,7 @@ def delete_account(request, payload: dict):
     
     **Returns:**
     - `success` (bool): Whether the deletion was successful
+    - `deleted` (int): Number of user accounts deleted
     
     **Errors:**
     - `400`: Nickname confirmation doesn't match
@@ -530,15 +543,15 @@ def delete_account(request, payload: dict):
     if not user_data:
         return 401, {'detail': 'Invalid token'}
     
-    user = get_object_or_404(User, uid=user_data['uid'])
+    user = get_object_or_404(User.objects.only('uid', 'nickname'), uid=user_data['uid'])
     
     # Verify nickname for confirmation
     if 'nickname' not in payload or payload['nickname'] != user.nickname:
         return 400, {'detail': 'Nickname confirmation does not match'}
     
-    # Delete the user
-    user.delete()
+    # Delete the user; report the deleted account count (cascaded rows are counted separately)
+    _, deleted_per_model = user.delete()
     
-    return {'success': True}
+    return {'success': True, 'deleted': deleted_per_model.get(User._meta.label, 0)}
 
 
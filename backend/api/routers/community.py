@@ -1,23 +1,72 @@
 from ninja import Router
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
 from django.shortcuts import get_object_or_404
 from typing import List
 from uuid import UUID
 from django.utils.text import slugify
 from api.models import Community
 from api.schemas import CommunitySchema, CommunityCreateSchema, CommunityUpdateSchema
-from api.auth import has_permission
+from api.auth import request_has_permission
+from api.signals import COMMUNITY_SLUG_CACHE_TIMEOUT, community_slug_cache_enabled, community_slug_cache_key
 
 router = Router()
 
 
+def _members_and_leaders(community):
+    """
+    Split a community's users into members and leaders.
+    
+    Leaders hold the community.{slug}.leader permission; the check is folded into the
+    member query as an EXISTS subquery instead of one query per user.
+    """
+    from api.models import User, Permission
+    
+    is_leader = Permission.objects.filter(
+        user=OuterRef('pk'),
+        permission=f'community.{community.slug}.leader'
+    )
+    community_users = User.objects.filter(community=community).annotate(
+        is_leader=Exists(is_leader)
+    ).values('uid', 'nickname', 'steam_id', 'is_leader')
+    
+    members = []
+    leaders = []
+    
+    for user in community_users:
+        user_data = {
+            'uid': user['uid'],
+            'nickname': user['nickname'],
+            'steamId': user['steam_id'],
+        }
+        
+        if user['is_leader']:
+            leaders.append(user_data)
+        else:
+            members.append(user_data)
+    
+    return members, leaders
+
+
 @router.get('/slugAvailable', auth=None)
 def check_slug_availability(request, slug: str):
     """Check if a community slug is available"""
-    # Check if a community with this slug already exists
-    exists = Community.objects.filter(slug=slug).exists()
+    if not community_slug_cache_enabled():
+        # Check if a community with this slug already exists
+        return {
+            'available': not Community.objects.filter(slug=slug).exists()
+        }
+    
+    # Slug pickers call this on every keystroke; answers are invalidated by api.signals
+    cache_key = community_slug_cache_key(slug)
+    available = cache.get(cache_key)
+    
+    if available is None:
+        available = not Community.objects.filter(slug=slug).exists()
+        cache.set(cache_key, available, COMMUNITY_SLUG_CACHE_TIMEOUT)
     
     return {
-        'available': not exists
+        'available': available
     }
 
 
@@ -51,31 +100,7 @@ def get_community(request, slug: str):
     community = get_object_or_404(Community, slug=slug)
     
     # Get members and leaders
-    from api.models import User, Permission
-    
-    members = []
-    leaders = []
-    
-    # Get all users in this community
-    community_users = User.objects.filter(community=community).select_related('community')
-    
-    for user in community_users:
-        user_data = {
-            'uid': user.uid,
-            'nickname': user.nickname,
-            'steamId': user.steam_id,
-        }
-        
-        # Check if user is a leader (has community.{slug}.leader permission)
-        is_leader = Permission.objects.filter(
-            user=user,
-            permission=f'community.{slug}.leader'
-        ).exists()
-        
-        if is_leader:
-            leaders.append(user_data)
-        else:
-            members.append(user_data)
+    members, leaders = _members_and_leaders(community)
     
     return {
         'community': {
@@ -97,8 +122,7 @@ def get_community(request, slug: str):
 @router.post('/', response={200: dict, 403: dict})
 def create_community(request, payload: CommunityCreateSchema):
     """Create a new community"""
-    permissions = request.auth.get('permissions', [])
-    if not has_permission(permissions, 'admin.community'):
+    if not request_has_permission(request, 'admin.community'):
         return 403, {'detail': 'Forbidden'}
     
     # Generate slug from name
@@ -134,8 +158,7 @@ def create_community(request, payload: CommunityCreateSchema):
 @router.patch('/{slug}', response={200: dict, 403: dict})
 def update_community(request, slug: str, payload: CommunityUpdateSchema):
     """Update a community"""
-    permissions = request.auth.get('permissions', [])
-    if not has_permission(permissions, 'admin.community'):
+    if not request_has_permission(request, 'admin.community'):
         return 403, {'detail': 'Forbidden'}
     
     community = get_object_or_404(Community, slug=slug)
@@ -156,29 +179,7 @@ def update_community(request, slug: str, payload: CommunityUpdateSchema):
     community.save()
     
     # Get members and leaders for updated response
-    from api.models import User, Permission
-    
-    members = []
-    leaders = []
-    
-    community_users = User.objects.filter(community=community).select_related('community')
-    
-    for user in community_users:
-        user_data = {
-            'uid': user.uid,
-            'nickname': user.nickname,
-            'steamId': user.steam_id,
-        }
-        
-        is_leader = Permission.objects.filter(
-            user=user,
-            permission=f'community.{slug}.leader'
-        ).exists()
-        
-        if is_leader:
-            leaders.append(user_data)
-        else:
-            members.append(user_data)
+    members, leaders = _members_and_leaders(community)
     
     return {
         'community': {
@@ -200,8 +201,7 @@ def update_community(request, slug: str, payload: CommunityUpdateSchema):
 @router.delete('/{slug}', response={200: dict, 403: dict})
 def delete_community(request, slug: str):
     """Delete a community"""
-    permissions = request.auth.get('permissions', [])
-    if not has_permission(permissions, 'admin.community'):
+    if not request_has_permission(request, 'admin.community'):
         return 403, {'detail': 'Forbidden'}
     
     community = get_object_or_404(Community, slug=slug)
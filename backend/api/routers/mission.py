@@ -12,7 +12,7 @@ from api.schemas import (
     MissionSlotGroupCreateSchema, MissionSlotGroupUpdateSchema,
     MissionSlotCreateSchema, MissionSlotUpdateSchema
 )
-from api.auth import has_permission, generate_jwt
+from api.auth import request_has_permission, generate_jwt
 
 router = Router()
 
@@ -302,10 +302,9 @@ def update_mission(request, slug: str, payload: MissionUpdateSchema):
     
     # Check permissions
     user_uid = request.auth.get('user', {}).get('uid')
-    permissions = request.auth.get('permissions', [])
     
     is_creator = str(mission.creator.uid) == user_uid
-    is_admin = has_permission(permissions, 'admin.mission')
+    is_admin = request_has_permission(request, 'admin.mission')
     
     if not is_creator and not is_admin:
         return 403, {'detail': 'Forbidden'}
@@ -423,10 +422,9 @@ def delete_mission(request, slug: str):
     
     # Check permissions
     user_uid = request.auth.get('user', {}).get('uid')
-    permissions = request.auth.get('permissions', [])
     
     is_creator = str(mission.creator.uid) == user_uid
-    is_admin = has_permission(permissions, 'admin.mission')
+    is_admin = request_has_permission(request, 'admin.mission')
     
     if not is_creator and not is_admin:
         return 403, {'detail': 'Forbidden'}
@@ -576,7 +574,6 @@ def update_slot_registration(request, slug: str, slot_uid: UUID, registration_ui
     """Update/confirm a slot registration (requires permissions)"""
     user_uid = request.auth.get('user', {}).get('uid')
     user = get_object_or_404(User, uid=user_uid)
-    permissions = request.auth.get('permissions', [])
     
     mission = get_object_or_404(Mission, slug=slug)
     slot = get_object_or_404(MissionSlot, uid=slot_uid, slot_group__mission=mission)
@@ -585,7 +582,7 @@ def update_slot_registration(request, slug: str, slot_uid: UUID, registration_ui
     
     # Check permissions - user must be mission creator or have appropriate permissions
     is_creator = str(mission.creator.uid) == str(user.uid)
-    has_perm = has_permission(permissions, ['mission.slot.assign', 'admin.*'])
+    has_perm = request_has_permission(request, ['mission.slot.assign', 'admin.*'])
     
     if not is_creator and not has_perm:
         return 403, {'detail': 'Insufficient permissions to confirm registration'}
@@ -639,7 +636,6 @@ def delete_slot_registration(request, slug: str, slot_uid: UUID, registration_ui
     """Delete/unregister from a slot"""
     user_uid = request.auth.get('user', {}).get('uid')
     user = get_object_or_404(User, uid=user_uid)
-    permissions = request.auth.get('permissions', [])
     
     mission = get_object_or_404(Mission, slug=slug)
     slot = get_object_or_404(MissionSlot, uid=slot_uid, slot_group__mission=mission)
@@ -648,7 +644,7 @@ def delete_slot_registration(request, slug: str, slot_uid: UUID, registration_ui
     # User can delete their own registration, or mission creator/admin can delete any
     is_own_registration = str(registration.user.uid) == str(user.uid)
     is_creator = str(mission.creator.uid) == str(user.uid)
-    has_perm = has_permission(permissions, ['mission.slot.assign', 'admin.*'])
+    has_perm = request_has_permission(request, ['mission.slot.assign', 'admin.*'])
     
     if not is_own_registration and not is_creator and not has_perm:
         return 403, {'detail': 'Insufficient permissions to delete this registration'}
@@ -663,7 +659,6 @@ def unassign_slot(request, slug: str, slot_uid: UUID):
     """Unassign a user from a mission slot"""
     user_uid = request.auth.get('user', {}).get('uid')
     user = get_object_or_404(User, uid=user_uid)
-    permissions = request.auth.get('permissions', [])
     
     mission = get_object_or_404(Mission, slug=slug)
     slot = get_object_or_404(MissionSlot, uid=slot_uid, slot_group__mission=mission)
@@ -674,7 +669,7 @@ def unassign_slot(request, slug: str, slot_uid: UUID):
     # Check permissions - user must be the assignee, mission creator, or have appropriate permissions
     is_assignee = str(slot.assignee.uid) == str(user.uid)
     is_creator = str(mission.creator.uid) == str(user.uid)
-    has_perm = has_permission(permissions, ['mission.slot.assign', 'admin.*'])
+    has_perm = request_has_permission(request, ['mission.slot.assign', 'admin.*'])
     
     if not is_assignee and not is_creator and not has_perm:
         return 403, {'detail': 'Insufficient permissions to unassign this slot'}
@@ -698,10 +693,9 @@ def create_mission_slot_group(request, slug: str, data: MissionSlotGroupCreateSc
     
     # Check permissions
     user_uid = request.auth.get('user', {}).get('uid')
-    permissions = request.auth.get('permissions', [])
     
     is_creator = str(mission.creator.uid) == user_uid
-    is_admin = has_permission(permissions, 'admin.mission')
+    is_admin = request_has_permission(request, 'admin.mission')
     
     if not is_creator and not is_admin:
         from ninja.errors import HttpError
@@ -746,10 +740,9 @@ def update_mission_slot_group(request, slug: str, slot_group_uid: UUID, data: Mi
     
     # Check permissions
     user_uid = request.auth.get('user', {}).get('uid')
-    permissions = request.auth.get('permissions', [])
     
     is_creator = str(mission.creator.uid) == user_uid
-    is_admin = has_permission(permissions, 'admin.mission')
+    is_admin = request_has_permission(request, 'admin.mission')
     
     if not is_creator and not is_admin:
         from ninja.errors import HttpError
@@ -805,10 +798,9 @@ def delete_mission_slot_group(request, slug: str, slot_group_uid: UUID):
     
     # Check permissions
     user_uid = request.auth.get('user', {}).get('uid')
-    permissions = request.auth.get('permissions', [])
     
     is_creator = str(mission.creator.uid) == user_uid
-    is_admin = has_permission(permissions, 'admin.mission')
+    is_admin = request_has_permission(request, 'admin.mission')
     
     if not is_creator and not is_admin:
         from ninja.errors import HttpError
@@ -836,10 +828,9 @@ def create_mission_slots(request, slug: str, data: List[MissionSlotCreateSchema]
     
     # Check permissions
     user_uid = request.auth.get('user', {}).get('uid')
-    permissions = request.auth.get('permissions', [])
     
     is_creator = str(mission.creator.uid) == user_uid
-    is_admin = has_permission(permissions, 'admin.mission')
+    is_admin = request_has_permission(request, 'admin.mission')
     
     if not is_creator and not is_admin:
         from ninja.errors import HttpError
@@ -914,10 +905,9 @@ def update_mission_slot(request, slug: str, slot_uid: UUID, data: MissionSlotUpd
     
     # Check permissions
     user_uid = request.auth.get('user', {}).get('uid')
-    permissions = request.auth.get('permissions', [])
     
     is_creator = str(mission.creator.uid) == user_uid
-    is_admin = has_permission(permissions, 'admin.mission')
+    is_admin = request_has_permission(request, 'admin.mission')
     
     if not is_creator and not is_admin:
         from ninja.errors import HttpError
@@ -996,10 +986,9 @@ def delete_mission_slot(request, slug: str, slot_uid: UUID):
     
     # Check permissions
     user_uid = request.auth.get('user', {}).get('uid')
-    permissions = request.auth.get('permissions', [])
     
     is_creator = str(mission.creator.uid) == user_uid
-    is_admin = has_permission(permissions, 'admin.mission')
+    is_admin = request_has_permission(request, 'admin.mission')
     
     if not is_creator and not is_admin:
         from ninja.errors import HttpError
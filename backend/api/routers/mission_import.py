@@ -6,6 +6,7 @@ from api.schemas import (
     ErrorResponseSchema
 )
 from api.import_utils import (
+    ensure_mission_not_imported,
     fetch_mission_data,
     import_mission,
     preview_import,
@@ -13,11 +14,10 @@ from api.import_utils import (
     CreatorNotFoundError,
     APIFetchError,
 )
-from api.routers.auth import JWTAuth
+from api.routers.auth import jwt_auth
 
 
 router = Router(tags=['Mission Import'])
-jwt_auth = JWTAuth()
 
 
 @router.post(
@@ -53,6 +53,10 @@ def import_mission_endpoint(request, payload: MissionImportRequestSchema):
     # For now, any authenticated user can import
     
     try:
+        # Bail out before the external request if the mission was imported already
+        if not payload.dry_run:
+            ensure_mission_not_imported(payload.slug)
+        
         # Fetch data from slotlist.info API
         mission_data, slots_data = fetch_mission_data(payload.slug)
         
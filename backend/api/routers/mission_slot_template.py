@@ -1,9 +1,14 @@
 from ninja import Router, Schema
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from typing import Optional, Any, List as ListType
 from uuid import UUID
-from api.models import MissionSlotTemplate, User, Community
-from api.auth import has_permission
+from api.models import Community, MissionSlotTemplate, User
+from api.auth import request_has_permission
+from api.http_cache import conditional_response, make_etag
 
 router = Router()
 
@@ -20,79 +25,132 @@ class MissionSlotTemplateUpdateSchema(Schema):
     communityUid: Optional[UUID] = None
 
 
+_TEMPLATE_FIELDS = (
+    'uid', 'title', 'slot_groups', 'created_at', 'updated_at',
+    'creator__uid', 'creator__nickname',
+    'community__uid', 'community__name', 'community__tag', 'community__slug',
+)
+
+
+def _normalize_slot_groups(groups):
+    """Drop non-dict entries and make sure every slot group has a slots array"""
+    if all(isinstance(group, dict) and 'slots' in group for group in groups):
+        return groups
+    return [{**group, 'slots': group.get('slots', [])} for group in groups if isinstance(group, dict)]
+
+
+def _check_foreign_keys():
+    """
+    Check the deferred FK constraints of the templates table right away.
+    
+    On PostgreSQL the constraints are DEFERRABLE INITIALLY DEFERRED, so inside an enclosing
+    transaction an unknown uid would otherwise only fail at the outer commit. Raises
+    IntegrityError, which has to happen inside the atomic block of the write.
+    """
+    connection.check_constraints(table_names=[MissionSlotTemplate._meta.db_table])
+
+
+def _community_fields(request, community_uid) -> Optional[dict]:
+    """Response fields of a community, taken from the token when it's the user's own community"""
+    if community_uid is None:
+        return None
+    own = request.auth.get('user', {}).get('community')
+    if own and own['uid'] == str(community_uid):
+        return own
+    return Community.objects.values('uid', 'name', 'tag', 'slug').filter(uid=community_uid).first()
+
+
+def _template_row(template, creator, community):
+    """Flat .values(*_TEMPLATE_FIELDS)-style row of a template whose related fields are at hand"""
+    community = community or {}
+    return {
+        'uid': template.uid,
+        'title': template.title,
+        'slot_groups': template.slot_groups,
+        'created_at': template.created_at,
+        'updated_at': template.updated_at,
+        'creator__uid': creator['uid'],
+        'creator__nickname': creator['nickname'],
+        'community__uid': community.get('uid'),
+        'community__name': community.get('name'),
+        'community__tag': community.get('tag'),
+        'community__slug': community.get('slug'),
+    }
+
+
+def _serialize_template(row):
+    """Build the API representation of a template from a flat .values(*_TEMPLATE_FIELDS) row"""
+    return {
+        'uid': row['uid'],
+        'title': row['title'],
+        # Rows written by this API are normalized already; older rows may still lack 'slots'
+        'slotGroups': _normalize_slot_groups(row['slot_groups'] or []),
+        'creator': {
+            'uid': row['creator__uid'],
+            'nickname': row['creator__nickname'],
+        },
+        'community': {
+            'uid': row['community__uid'],
+            'name': row['community__name'],
+            'tag': row['community__tag'],
+            'slug': row['community__slug'],
+        } if row['community__uid'] else None,
+        'createdAt': row['created_at'],
+        'updatedAt': row['updated_at'],
+    }
+
+
 @router.get('/', auth=None)
-def list_mission_slot_templates(request, limit: int = 25, offset: int = 0):
+def list_mission_slot_templates(request, response: HttpResponse, limit: int = 25, offset: int = 0):
     """List all mission slot templates with pagination"""
-    total = MissionSlotTemplate.objects.count()
-    templates = MissionSlotTemplate.objects.select_related('creator', 'community').all()[offset:offset + limit]
+    # Validate against the newest change of anything rendered; the count also catches deletions
+    state = MissionSlotTemplate.objects.aggregate(
+        total=Count('uid'),
+        updated_at=Max('updated_at'),
+        creator_updated_at=Max('creator__updated_at'),
+        community_updated_at=Max('community__updated_at'),
+    )
+    total = state['total']
+    last_modified = max(
+        filter(None, (state['updated_at'], state['creator_updated_at'], state['community_updated_at'])),
+        default=None
+    )
+    # ETag only: a Last-Modified of the newest change wouldn't move when a template is deleted,
+    # so If-Modified-Since alone would get a wrong 304
+    not_modified = conditional_response(request, response, make_etag(total, last_modified, limit, offset))
+    if not_modified is not None:
+        return not_modified
+    
+    # Stable page contents, so the ETag of a page describes what it actually returns
+    rows = MissionSlotTemplate.objects.order_by('title', 'uid').values(*_TEMPLATE_FIELDS)[offset:offset + limit]
     
     return {
-        'slotTemplates': [
-            {
-                'uid': str(template.uid),
-                'title': template.title,
-                'slotGroups': template.slot_groups,
-                'creator': {
-                    'uid': str(template.creator.uid),
-                    'nickname': template.creator.nickname,
-                },
-                'community': {
-                    'uid': str(template.community.uid),
-                    'name': template.community.name,
-                    'tag': template.community.tag,
-                    'slug': template.community.slug,
-                } if template.community else None,
-                'createdAt': template.created_at.isoformat() if template.created_at else None,
-                'updatedAt': template.updated_at.isoformat() if template.updated_at else None,
-            }
-            for template in templates
-        ],
+        'slotTemplates': [_serialize_template(row) for row in rows],
         'total': total
     }
 
 
 @router.get('/{uid}', auth=None)
-def get_mission_slot_template(request, uid: UUID):
+def get_mission_slot_template(request, response: HttpResponse, uid: UUID):
     """Get a single mission slot template by UID"""
-    template = get_object_or_404(MissionSlotTemplate.objects.select_related('creator', 'community'), uid=uid)
-    
-    # Ensure each slot group has a slots array
-    slot_groups = template.slot_groups or []
-    # Make a copy to avoid modifying the original
-    slot_groups_copy = []
-    for group in slot_groups:
-        if isinstance(group, dict):
-            # It's already a dict, ensure it has slots
-            group_copy = dict(group)
-            if 'slots' not in group_copy:
-                group_copy['slots'] = []
-            slot_groups_copy.append(group_copy)
-        else:
-            # Skip non-dict items
-            continue
+    # Cheap validator lookup first; the slot_groups blob is only loaded when it has to be sent
+    state = get_object_or_404(
+        MissionSlotTemplate.objects.values('updated_at', 'creator__updated_at', 'community__updated_at'),
+        uid=uid
+    )
+    last_modified = max(filter(None, state.values()), default=None)
+    not_modified = conditional_response(
+        request, response, make_etag(uid, *state.values()), last_modified
+    )
+    if not_modified is not None:
+        return not_modified
     
-    return {
-        'slotTemplate': {
-            'uid': str(template.uid),
-            'title': template.title,
-            'slotGroups': slot_groups_copy,
-            'creator': {
-                'uid': str(template.creator.uid),
-                'nickname': template.creator.nickname,
-            },
-            'community': {
-                'uid': str(template.community.uid),
-                'name': template.community.name,
-                'tag': template.community.tag,
-                'slug': template.community.slug,
-            } if template.community else None,
-            'createdAt': template.created_at.isoformat() if template.created_at else None,
-            'updatedAt': template.updated_at.isoformat() if template.updated_at else None,
-        }
-    }
+    row = get_object_or_404(MissionSlotTemplate.objects.values(*_TEMPLATE_FIELDS), uid=uid)
+    
+    return {'slotTemplate': _serialize_template(row)}
 
 
-@router.post('/')
+@router.post('/', response={200: dict, 400: dict, 401: dict})
 def create_mission_slot_template(request, payload: MissionSlotTemplateCreateSchema):
     """Create a new mission slot template"""
     if not request.auth:
@@ -102,48 +160,25 @@ def create_mission_slot_template(request, payload: MissionSlotTemplateCreateSche
     if not user_uid:
         return 401, {'detail': 'Invalid authentication'}
     
-    user = get_object_or_404(User, uid=user_uid)
-    
-    community = None
-    if payload.communityUid:
-        community = get_object_or_404(Community, uid=payload.communityUid)
-    
-    template = MissionSlotTemplate.objects.create(
-        title=payload.title,
-        slot_groups=payload.slotGroups,
-        creator=user,
-        community=community
-    )
-    
-    # Ensure slot groups have slots arrays
-    slot_groups = template.slot_groups or []
-    slot_groups_copy = []
-    for group in slot_groups:
-        if isinstance(group, dict):
-            group_copy = dict(group)
-            if 'slots' not in group_copy:
-                group_copy['slots'] = []
-            slot_groups_copy.append(group_copy)
+    # Attach the foreign keys by id and let the FK constraints reject unknown uids
+    try:
+        with transaction.atomic():
+            template = MissionSlotTemplate.objects.create(
+                title=payload.title,
+                slot_groups=_normalize_slot_groups(payload.slotGroups),
+                creator_id=user_uid,
+                community_id=payload.communityUid
+            )
+            _check_foreign_keys()
+    except IntegrityError:
+        # Only on the failure path: a creator that no longer exists is still a 404
+        if not User.objects.filter(uid=user_uid).exists():
+            raise Http404
+        return 400, {'detail': 'Unknown community'}
     
-    return {
-        'slotTemplate': {
-            'uid': str(template.uid),
-            'title': template.title,
-            'slotGroups': slot_groups_copy,
-            'creator': {
-                'uid': str(template.creator.uid),
-                'nickname': template.creator.nickname,
-            },
-            'community': {
-                'uid': str(template.community.uid),
-                'name': template.community.name,
-                'tag': template.community.tag,
-                'slug': template.community.slug,
-            } if template.community else None,
-            'createdAt': template.created_at.isoformat() if template.created_at else None,
-            'updatedAt': template.updated_at.isoformat() if template.updated_at else None,
-        }
-    }
+    # Everything rendered is known already: the creator comes from the token
+    row = _template_row(template, request.auth['user'], _community_fields(request, payload.communityUid))
+    return {'slotTemplate': _serialize_template(row)}
 
 
 @router.delete('/{uid}')
@@ -153,10 +188,9 @@ def delete_mission_slot_template(request, uid: UUID):
     
     # Check permissions
     user_uid = request.auth.get('user', {}).get('uid')
-    permissions = request.auth.get('permissions', [])
     
     is_creator = str(template.creator.uid) == user_uid
-    is_admin = has_permission(permissions, 'admin.slotTemplate')
+    is_admin = request_has_permission(request, 'admin.slotTemplate')
     
     if not is_creator and not is_admin:
         return 403, {'detail': 'Forbidden'}
@@ -165,61 +199,62 @@ def delete_mission_slot_template(request, uid: UUID):
     return {'success': True}
 
 
-@router.patch('/{uid}', response={200: dict, 401: dict, 403: dict})
+@router.patch('/{uid}', response={200: dict, 400: dict, 401: dict, 403: dict})
 def update_mission_slot_template(request, uid: UUID, payload: MissionSlotTemplateUpdateSchema):
     """Update a mission slot template"""
     if not request.auth:
         return 401, {'detail': 'Authentication required'}
     
-    template = get_object_or_404(MissionSlotTemplate, uid=uid)
+    # Load everything the response needs along with the creator for the permission check;
+    # the slot_groups blob only when the payload doesn't replace it
+    templates = MissionSlotTemplate.objects.select_related('creator', 'community').only(
+        'uid', 'title', 'slot_groups', 'created_at', 'updated_at',
+        'creator__uid', 'creator__nickname',
+        'community__uid', 'community__name', 'community__tag', 'community__slug',
+    )
+    if payload.slotGroups is not None:
+        templates = templates.defer('slot_groups')
+    template = get_object_or_404(templates, uid=uid)
     
     # Check permissions
     user_uid = request.auth.get('user', {}).get('uid')
-    permissions = request.auth.get('permissions', [])
     
-    is_creator = str(template.creator.uid) == user_uid
-    is_admin = has_permission(permissions, 'admin.slotTemplate')
+    is_creator = str(template.creator_id) == user_uid
+    is_admin = request_has_permission(request, 'admin.slotTemplate')
     
     if not is_creator and not is_admin:
         return 403, {'detail': 'Forbidden'}
     
-    # Update fields
+    # Update only the provided fields in a single UPDATE
+    changes = {}
     if payload.title is not None:
-        template.title = payload.title
+        changes['title'] = payload.title
     if payload.slotGroups is not None:
-        template.slot_groups = payload.slotGroups
+        changes['slot_groups'] = _normalize_slot_groups(payload.slotGroups)
     if payload.communityUid is not None:
-        community = get_object_or_404(Community, uid=payload.communityUid)
-        template.community = community
+        changes['community_id'] = payload.communityUid
     
-    template.save()
+    # Taken before the changes are applied to the instance, which would drop the loaded relations
+    creator = {'uid': template.creator.uid, 'nickname': template.creator.nickname}
+    community_changed = payload.communityUid is not None and payload.communityUid != template.community_id
+    community = None if community_changed or template.community is None else {
+        'uid': template.community.uid,
+        'name': template.community.name,
+        'tag': template.community.tag,
+        'slug': template.community.slug,
+    }
     
-    # Ensure slot groups have slots arrays
-    slot_groups = template.slot_groups or []
-    slot_groups_copy = []
-    for group in slot_groups:
-        if isinstance(group, dict):
-            group_copy = dict(group)
-            if 'slots' not in group_copy:
-                group_copy['slots'] = []
-            slot_groups_copy.append(group_copy)
+    if changes:
+        changes['updated_at'] = timezone.now()
+        try:
+            with transaction.atomic():
+                MissionSlotTemplate.objects.filter(uid=uid).update(**changes)
+                _check_foreign_keys()
+        except IntegrityError:
+            return 400, {'detail': 'Unknown community'}
+        for field, value in changes.items():
+            setattr(template, field, value)
+        if community_changed:
+            community = _community_fields(request, payload.communityUid)
     
-    return {
-        'slotTemplate': {
-            'uid': str(template.uid),
-            'title': template.title,
-            'slotGroups': slot_groups_copy,
-            'creator': {
-                'uid': str(template.creator.uid),
-                'nickname': template.creator.nickname,
-            },
-            'community': {
-                'uid': str(template.community.uid),
-                'name': template.community.name,
-                'tag': template.community.tag,
-                'slug': template.community.slug,
-            } if template.community else None,
-            'createdAt': template.created_at.isoformat() if template.created_at else None,
-            'updatedAt': template.updated_at.isoformat() if template.updated_at else None,
-        }
-    }
+    return {'slotTemplate': _serialize_template(_template_row(template, creator, community))}
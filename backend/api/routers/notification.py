@@ -4,9 +4,15 @@ from typing import List
 from uuid import UUID
 from api.models import Notification, User
 from api.schemas import NotificationSchema
+from api.renderers import json_response
 
 router = Router()
 
+# Notification columns, named exactly like the NotificationSchema fields
+_NOTIFICATION_FIELDS = (
+    'uid', 'notification_type', 'title', 'message', 'additional_data', 'read', 'created_at',
+)
+
 
 @router.get('/', response=List[NotificationSchema])
 def list_notifications(request, limit: int = 25, offset: int = 0, unread_only: bool = False):
@@ -19,20 +25,10 @@ def list_notifications(request, limit: int = 25, offset: int = 0, unread_only: b
     if unread_only:
         query = query.filter(read=False)
     
-    notifications = query[offset:offset + limit]
+    notifications = query.order_by('-created_at').values(*_NOTIFICATION_FIELDS)[offset:offset + limit]
     
-    return [
-        {
-            'uid': notif.uid,
-            'notification_type': notif.notification_type,
-            'title': notif.title,
-            'message': notif.message,
-            'additional_data': notif.additional_data,
-            'read': notif.read,
-            'created_at': notif.created_at
-        }
-        for notif in notifications
-    ]
+    # Rows already match NotificationSchema; render them without re-validating every item
+    return json_response(list(notifications))
 
 
 @router.get('/unseen')
@@ -50,17 +46,11 @@ def get_unseen_count(request):
 def get_notification(request, notification_uid: UUID):
     """Get a single notification"""
     user_uid = request.auth.get('user', {}).get('uid')
-    notification = get_object_or_404(Notification, uid=notification_uid, user__uid=user_uid)
+    notification = get_object_or_404(
+        Notification.objects.values(*_NOTIFICATION_FIELDS), uid=notification_uid, user__uid=user_uid
+    )
     
-    return {
-        'uid': notification.uid,
-        'notification_type': notification.notification_type,
-        'title': notification.title,
-        'message': notification.message,
-        'additional_data': notification.additional_data,
-        'read': notification.read,
-        'created_at': notification.created_at
-    }
+    return json_response(notification)
 
 
 @router.patch('/{notification_uid}/read')
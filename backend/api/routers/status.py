@@ -1,21 +1,26 @@
+import time
+from django.utils.cache import patch_cache_control
 from ninja import Router
+from api.renderers import json_response
 from api.schemas import StatusResponseSchema
-from datetime import datetime
 
 router = Router()
 
-# Store startup time
-startup_time = datetime.utcnow()
+_VERSION = '2.0.0'
+
+# Store startup time (monotonic, so uptime isn't skewed by wall clock adjustments)
+_START_NS = time.monotonic_ns()
 
 
 @router.get('/status', response=StatusResponseSchema, auth=None)
 def get_status(request):
     """Get API status and uptime"""
-    current_time = datetime.utcnow()
-    uptime = int((current_time - startup_time).total_seconds())
-    
-    return {
+    # Health probes hit this a lot, so render straight to a response without schema validation
+    response = json_response({
         'status': 'operational',
-        'uptime': uptime,
-        'version': '2.0.0'
-    }
+        'uptime': (time.monotonic_ns() - _START_NS) // 1_000_000_000,
+        'version': _VERSION
+    })
+    # Let the CDN/proxies answer probes; uptime being a second stale doesn't matter
+    patch_cache_control(response, public=True, max_age=1)
+    return response
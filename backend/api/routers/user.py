@@ -1,40 +1,94 @@
+from operator import attrgetter
 from ninja import Router
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max, Prefetch
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_vary_headers
+from pydantic import TypeAdapter
 from typing import List
 from uuid import UUID
 from api.models import User, Permission
 from api.schemas import UserSchema, UserDetailSchema, UserUpdateSchema, PermissionSchema
-from api.auth import has_permission
+from api.auth import request_has_permission
+from api.http_cache import conditional_response, make_etag
+from api.query_utils import apply_prefetch
 
 router = Router()
 
+_PERMISSION_LIST_ADAPTER = TypeAdapter(List[PermissionSchema])
+
+# Response keys of a user's community and the model attributes they are read from
+_COMMUNITY_KEYS = (
+    'uid', 'name', 'tag', 'slug', 'website', 'logoUrl', 'gameServers', 'voiceComms', 'repositories',
+)
+_COMMUNITY_ATTRS = attrgetter(
+    'uid', 'name', 'tag', 'slug', 'website', 'logo_url', 'game_servers', 'voice_comms', 'repositories',
+)
+
+
+def _community_dict(community):
+    """Render a user's community, or None if they don't belong to one"""
+    if community is None:
+        return None
+    return dict(zip(_COMMUNITY_KEYS, _COMMUNITY_ATTRS(community)))
+
+
+# Columns the single-user responses render (the community is joined in full)
+_USER_FIELDS = ('uid', 'nickname', 'steam_id', 'active', 'community')
+
+_USER_LIST_FIELDS = (
+    'uid', 'nickname', 'steam_id', 'active',
+    'community__uid', 'community__name', 'community__tag', 'community__slug', 'community__website',
+    'community__logo_url', 'community__game_servers', 'community__voice_comms', 'community__repositories',
+)
+
 
 @router.get('/')
-def list_users(request, limit: int = 25, offset: int = 0):
+def list_users(request, response: HttpResponse, limit: int = 25, offset: int = 0):
     """List all users with pagination"""
-    total = User.objects.count()
-    users = User.objects.select_related('community').all()[offset:offset + limit]
+    # Validate against the newest user/community change; the counts also catch deletions
+    # and communities being removed from users (SET_NULL doesn't touch updated_at)
+    state = User.objects.aggregate(
+        total=Count('uid'),
+        with_community=Count('community'),
+        updated_at=Max('updated_at'),
+        community_updated_at=Max('community__updated_at'),
+    )
+    total = state['total']
+    last_modified = max(filter(None, (state['updated_at'], state['community_updated_at'])), default=None)
+    # ETag only: a Last-Modified of max(updated_at) wouldn't change when a user is deleted,
+    # so If-Modified-Since alone would get a wrong 304
+    not_modified = conditional_response(
+        request, response,
+        make_etag(total, state['with_community'], last_modified, limit, offset)
+    )
+    if not_modified is not None:
+        return not_modified
+    
+    # Stable page contents, so the ETag of a page describes what it actually returns
+    rows = User.objects.order_by('nickname', 'uid').values(*_USER_LIST_FIELDS)[offset:offset + limit]
     
     return {
         'users': [
             {
-                'uid': str(user.uid),
-                'nickname': user.nickname,
-                'steamId': user.steam_id,
+                'uid': row['uid'],
+                'nickname': row['nickname'],
+                'steamId': row['steam_id'],
                 'community': {
-                    'uid': str(user.community.uid),
-                    'name': user.community.name,
-                    'tag': user.community.tag,
-                    'slug': user.community.slug,
-                    'website': user.community.website,
-                    'logoUrl': user.community.logo_url,
-                    'gameServers': user.community.game_servers,
-                    'voiceComms': user.community.voice_comms,
-                    'repositories': user.community.repositories
-                } if user.community else None,
-                'active': user.active
+                    'uid': row['community__uid'],
+                    'name': row['community__name'],
+                    'tag': row['community__tag'],
+                    'slug': row['community__slug'],
+                    'website': row['community__website'],
+                    'logoUrl': row['community__logo_url'],
+                    'gameServers': row['community__game_servers'],
+                    'voiceComms': row['community__voice_comms'],
+                    'repositories': row['community__repositories']
+                } if row['community__uid'] else None,
+                'active': row['active']
             }
-            for user in users
+            for row in rows
         ],
         'limit': limit,
         'offset': offset,
@@ -43,72 +97,92 @@ def list_users(request, limit: int = 25, offset: int = 0):
 
 
 @router.get('/{user_uid}')
-def get_user(request, user_uid: UUID):
+def get_user(request, response: HttpResponse, user_uid: UUID):
     """Get a single user by UID"""
-    user = get_object_or_404(User.objects.select_related('community').prefetch_related('missions'), uid=user_uid)
-    
     # Check if requesting user has admin permissions
-    include_admin_details = False
-    if request.auth:
-        permissions = request.auth.get('permissions', [])
-        include_admin_details = has_permission(permissions, 'admin.user')
+    include_admin_details = request_has_permission(request, 'admin.user')
+    
+    # Admins get a different representation, so caches must key on the token as well
+    patch_vary_headers(response, ('Authorization',))
+    state = get_object_or_404(
+        User.objects.values('updated_at', 'community_id', 'community__updated_at'),
+        uid=user_uid
+    )
+    last_modified = max(filter(None, (state['updated_at'], state['community__updated_at'])), default=None)
+    not_modified = conditional_response(
+        request, response,
+        make_etag(user_uid, include_admin_details, *state.values()),
+        last_modified
+    )
+    if not_modified is not None:
+        return not_modified
+    
+    user = get_object_or_404(apply_prefetch(User.objects.only(*_USER_FIELDS), UserSchema), uid=user_uid)
     
     return {
         'user': {
             'uid': str(user.uid),
             'nickname': user.nickname,
             'steamId': user.steam_id if include_admin_details else None,
-            'community': {
-                'uid': str(user.community.uid),
-                'name': user.community.name,
-                'tag': user.community.tag,
-                'slug': user.community.slug,
-                'website': user.community.website,
-                'logoUrl': user.community.logo_url,
-                'gameServers': user.community.game_servers,
-                'voiceComms': user.community.voice_comms,
-                'repositories': user.community.repositories
-            } if user.community else None,
+            'community': _community_dict(user.community),
             'active': user.active if include_admin_details else None,
             'missions': []
         }
     }
 
 
-@router.patch('/{user_uid}')
+@router.get('/{user_uid}/profile')
+def get_user_profile(request, user_uid: UUID):
+    """Get a user together with their community and permissions in a single request"""
+    user = get_object_or_404(
+        User.objects.select_related('community').prefetch_related(
+            Prefetch('permissions', queryset=Permission.objects.only('uid', 'permission', 'user_id'))
+        ),
+        uid=user_uid
+    )
+    
+    # Same visibility rules as GET /{user_uid} and GET /{user_uid}/permissions
+    include_admin_details = request_has_permission(request, 'admin.user')
+    is_self = str(user.uid) == request.auth.get('user', {}).get('uid')
+    include_permissions = is_self or request_has_permission(request, 'admin.permission')
+    
+    return {
+        'user': {
+            'uid': str(user.uid),
+            'nickname': user.nickname,
+            'steamId': user.steam_id if include_admin_details else None,
+            'active': user.active if include_admin_details else None
+        },
+        'community': _community_dict(user.community),
+        'permissions': [
+            {'uid': str(perm.uid), 'permission': perm.permission}
+            for perm in user.permissions.all()
+        ] if include_permissions else None
+    }
+
+
+@router.patch('/{user_uid}', response={200: dict, 403: dict})
 def update_user(request, user_uid: UUID, payload: UserUpdateSchema):
     """Update a user"""
-    user = get_object_or_404(User.objects.select_related('community'), uid=user_uid)
-    
-    # Check if user can update (must be self or admin)
+    # Check if user can update (must be self or admin) before touching the database
     auth_user_uid = request.auth.get('user', {}).get('uid')
-    permissions = request.auth.get('permissions', [])
     
-    if str(user.uid) != auth_user_uid and not has_permission(permissions, 'admin.user'):
+    if str(user_uid) != auth_user_uid and not request_has_permission(request, 'admin.user'):
         return 403, {'detail': 'Forbidden'}
     
+    user = get_object_or_404(apply_prefetch(User.objects.only(*_USER_FIELDS), UserSchema), uid=user_uid)
+    
     # Update user fields
     if payload.nickname is not None:
         user.nickname = payload.nickname
-    
-    user.save()
+        user.save(update_fields=['nickname', 'updated_at'])
     
     return {
         'user': {
             'uid': str(user.uid),
             'nickname': user.nickname,
             'steamId': None,
-            'community': {
-                'uid': str(user.community.uid),
-                'name': user.community.name,
-                'tag': user.community.tag,
-                'slug': user.community.slug,
-                'website': user.community.website,
-                'logoUrl': user.community.logo_url,
-                'gameServers': user.community.game_servers,
-                'voiceComms': user.community.voice_comms,
-                'repositories': user.community.repositories
-            } if user.community else None,
+            'community': _community_dict(user.community),
             'active': None
         }
     }
@@ -139,20 +213,20 @@ def list_user_missions(request, user_uid: UUID, limit: int = 10, offset: int = 0
     return {
         'missions': [
             {
-                'uid': str(mission.uid),
+                'uid': mission.uid,
                 'slug': mission.slug,
                 'title': mission.title,
-                'briefingTime': mission.briefing_time.isoformat() if mission.briefing_time else None,
-                'slottingTime': mission.slotting_time.isoformat() if mission.slotting_time else None,
-                'startTime': mission.start_time.isoformat() if mission.start_time else None,
-                'endTime': mission.end_time.isoformat() if mission.end_time else None,
+                'briefingTime': mission.briefing_time,
+                'slottingTime': mission.slotting_time,
+                'startTime': mission.start_time,
+                'endTime': mission.end_time,
                 'visibility': mission.visibility,
                 'creator': {
-                    'uid': str(mission.creator.uid),
+                    'uid': mission.creator.uid,
                     'nickname': mission.creator.nickname
                 } if mission.creator else None,
                 'community': {
-                    'uid': str(mission.community.uid),
+                    'uid': mission.community.uid,
                     'name': mission.community.name,
                     'tag': mission.community.tag,
                     'slug': mission.community.slug
@@ -168,29 +242,34 @@ def list_user_missions(request, user_uid: UUID, limit: int = 10, offset: int = 0
     }
 
 
-@router.get('/{user_uid}/permissions', response=List[PermissionSchema])
+@router.get('/{user_uid}/permissions', response={200: List[PermissionSchema], 403: dict})
 def list_user_permissions(request, user_uid: UUID):
     """List permissions for a user"""
-    permissions = request.auth.get('permissions', [])
-    if not has_permission(permissions, 'admin.permission'):
+    if not request_has_permission(request, 'admin.permission'):
         return 403, {'detail': 'Forbidden'}
     
-    user_permissions = Permission.objects.filter(user__uid=user_uid)
-    return [
-        {'uid': perm.uid, 'permission': perm.permission}
-        for perm in user_permissions
-    ]
+    user_permissions = Permission.objects.filter(user__uid=user_uid).values('uid', 'permission')
+    
+    # Validate and serialize to JSON bytes in pydantic-core, skipping Ninja's dump + render passes
+    permissions = _PERMISSION_LIST_ADAPTER.validate_python(list(user_permissions))
+    return HttpResponse(_PERMISSION_LIST_ADAPTER.dump_json(permissions), content_type='application/json')
 
 
-@router.post('/{user_uid}/permissions', response=PermissionSchema)
+@router.post('/{user_uid}/permissions', response={200: PermissionSchema, 403: dict})
 def create_user_permission(request, user_uid: UUID, permission: str):
     """Add a permission to a user"""
-    permissions = request.auth.get('permissions', [])
-    if not has_permission(permissions, 'admin.permission'):
+    if not request_has_permission(request, 'admin.permission'):
         return 403, {'detail': 'Forbidden'}
     
-    user = get_object_or_404(User, uid=user_uid)
-    perm, created = Permission.objects.get_or_create(user=user, permission=permission)
+    user = get_object_or_404(User.objects.only('uid'), uid=user_uid)
+    
+    # Insert straight away and let the (user, permission) unique constraint catch duplicates,
+    # so granting a new permission is a single INSERT instead of SELECT + INSERT
+    try:
+        with transaction.atomic():
+            perm = Permission.objects.create(user=user, permission=permission)
+    except IntegrityError:
+        perm = Permission.objects.only('uid', 'permission').get(user=user, permission=permission)
     
     return {'uid': perm.uid, 'permission': perm.permission}
 
@@ -198,8 +277,7 @@ def create_user_permission(request, user_uid: UUID, permission: str):
 @router.delete('/{user_uid}/permissions/{permission_uid}')
 def delete_user_permission(request, user_uid: UUID, permission_uid: UUID):
     """Remove a permission from a user"""
-    permissions = request.auth.get('permissions', [])
-    if not has_permission(permissions, 'admin.permission'):
+    if not request_has_permission(request, 'admin.permission'):
         return 403, {'detail': 'Forbidden'}
     
     permission = get_object_or_404(Permission, uid=permission_uid, user__uid=user_uid)
@@ -140,9 +140,6 @@ class MissionCreateSchema(Schema):
     repositories: Optional[List[Any]] = None
     rules_of_engagement: Optional[str] = Field('', alias='rulesOfEngagement')
     community_uid: Optional[UUID] = None
-    
-    class Config:
-        populate_by_name = True
 
 
 class MissionUpdateSchema(Schema):
@@ -165,9 +162,6 @@ class MissionUpdateSchema(Schema):
     voice_comms: Optional[Any] = Field(None, alias='voiceComms')
     repositories: Optional[List[Any]] = None
     rules_of_engagement: Optional[str] = Field(None, alias='rulesOfEngagement')
-    
-    class Config:
-        populate_by_name = True
 
 
 class UserUpdateSchema(Schema):
@@ -292,3 +286,7 @@ class MissionSlotUpdateSchema(Schema):
     blocked: Optional[bool] = None
     reserve: Optional[bool] = None
     autoAssignable: Optional[bool] = None
+
+
+# Resolve the forward reference to MissionSchema now rather than on first validation
+UserDetailSchema.model_rebuild()
@@ -0,0 +1,66 @@
+"""
+Signal handlers keeping cached API data in sync with the database.
+
+Connected in ApiConfig.ready().
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from api.auth import revoke_cached_tokens
+from api.models import Community, User
+
+# Seconds a slugAvailable answer may be served from the cache. Also bounds how long writes that
+# bypass the signals below (QuerySet.update(), bulk_create) can leave a stale answer around.
+COMMUNITY_SLUG_CACHE_TIMEOUT = 60
+
+# Cache backends that live inside a single process
+_PER_PROCESS_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def community_slug_cache_enabled() -> bool:
+    """
+    Whether slugAvailable answers are cached.
+    
+    Only with a cache shared by all workers (Redis): invalidation happens in the worker that
+    saved the community, so a per-process cache would keep stale answers in the others.
+    """
+    return settings.CACHES['default']['BACKEND'] not in _PER_PROCESS_CACHE_BACKENDS
+
+
+def community_slug_cache_key(slug: str) -> str:
+    """Cache key of the slugAvailable answer for a community slug"""
+    return f'community:slug:{slug}'
+
+
+@receiver(post_init, sender=Community)
+def remember_community_slug(sender, instance, **kwargs):
+    """Remember the slug a community was loaded with, so a rename can invalidate it"""
+    # Read from __dict__ so a deferred slug isn't fetched just for this
+    instance._loaded_slug = instance.__dict__.get('slug')
+
+
+@receiver(post_save, sender=Community)
+@receiver(post_delete, sender=Community)
+def invalidate_community_slug(sender, instance, **kwargs):
+    """Drop the cached availability of a community's slug when the community is created, changed or deleted"""
+    slugs = {instance.slug, instance._loaded_slug} - {None}
+    cache.delete_many([community_slug_cache_key(slug) for slug in slugs])
+    instance._loaded_slug = instance.slug
+
+
+@receiver(post_save, sender=User)
+def revoke_deactivated_user_tokens(sender, instance, **kwargs):
+    """Drop this process's cached tokens of a user who has been deactivated"""
+    if not instance.active:
+        revoke_cached_tokens(instance.uid)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    """Drop this process's cached tokens of a user whose account has been deleted"""
+    revoke_cached_tokens(instance.uid)
@@ -5,20 +5,66 @@ This module provides Steam OpenID authentication functionality for Django.
 It handles the Steam login flow, verification, and retrieving user information from Steam API.
 """
 
+import logging
 import re
+import orjson
 import requests
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, List
+from urllib.parse import parse_qsl, quote_plus, urlencode, urlsplit
+from urllib3.util.retry import Retry
 from django.conf import settings
+from django.core.cache import cache
+
+
+logger = logging.getLogger(__name__)
+
+# Steam ID from a claimed identifier: https://steamcommunity.com/openid/id/<STEAM_ID>
+_STEAM_ID_RE = re.compile(r'https?://steamcommunity\.com/openid/id/(\d+)\Z', re.ASCII)
+
+# Fixed part of the checkid_setup query; only return_to and realm vary per login
+_LOGIN_QUERY_PREFIX = urlencode({
+    'openid.ns': 'http://specs.openid.net/auth/2.0',
+    'openid.mode': 'checkid_setup',
+    'openid.identity': 'http://specs.openid.net/auth/2.0/identifier_select',
+    'openid.claimed_id': 'http://specs.openid.net/auth/2.0/identifier_select',
+})
 
 
 class SteamOpenIDService:
     """Service for Steam OpenID authentication"""
     
     STEAM_OPENID_URL = 'https://steamcommunity.com/openid'
+    # Steam's OpenID provider endpoint; positive assertions name it in openid.op_endpoint
+    OPENID_OP_ENDPOINT = f'{STEAM_OPENID_URL}/login'
+    # Login redirect with the constant parameters pre-encoded; only return_to and realm are filled in
+    LOGIN_URL_TEMPLATE = f'{STEAM_OPENID_URL}/login?{_LOGIN_QUERY_PREFIX}&openid.return_to={{return_to}}&openid.realm={{realm}}'
     STEAM_API_URL = 'https://api.steampowered.com'
+    PLAYER_SUMMARIES_URL = f'{STEAM_API_URL}/ISteamUser/GetPlayerSummaries/v0002/'
+    PLAYER_SUMMARY_CACHE_KEY = 'steam:summary:{}'
+    PLAYER_SUMMARY_CACHE_TIMEOUT = 600  # seconds
+    PLAYER_SUMMARIES_BATCH_SIZE = 100  # max steamids per GetPlayerSummaries call
+    AVATAR_KEYS = ('avatarfull', 'avatarmedium', 'avatar')  # largest first
+    STEAM_API_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+    
+    # OpenID 2.0 response fields Steam sends back; everything else in the callback is ignored
+    OPENID_FIELDS = frozenset((
+        'openid.ns', 'openid.mode', 'openid.op_endpoint', 'openid.claimed_id', 'openid.identity',
+        'openid.return_to', 'openid.response_nonce', 'openid.assoc_handle', 'openid.invalidate_handle',
+        'openid.signed', 'openid.sig',
+    ))
+    OPENID_MAX_QUERY_FIELDS = 64
     
     def __init__(self):
         self.steam_api_key = settings.STEAM_API_SECRET
+        
+        # Shared session so logins reuse keep-alive connections (and TLS sessions) to Steam
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504))
+        ))
     
     def get_login_url(self, return_url: str, realm: str) -> str:
         """
@@ -31,19 +77,8 @@ class SteamOpenIDService:
         Returns:
             str: Steam OpenID login URL to redirect user to
         """
-        from urllib.parse import urlencode
-        
         # Build OpenID parameters manually to avoid association issues
-        params = {
-            'openid.ns': 'http://specs.openid.net/auth/2.0',
-            'openid.mode': 'checkid_setup',
-            'openid.return_to': return_url,
-            'openid.realm': realm,
-            'openid.identity': 'http://specs.openid.net/auth/2.0/identifier_select',
-            'openid.claimed_id': 'http://specs.openid.net/auth/2.0/identifier_select',
-        }
-        
-        return f'{self.STEAM_OPENID_URL}/login?{urlencode(params)}'
+        return self.LOGIN_URL_TEMPLATE.format(return_to=quote_plus(return_url), realm=quote_plus(realm))
     
     def verify_and_get_steam_id(self, openid_url: str, return_url: str) -> Optional[str]:
         """
@@ -60,33 +95,44 @@ class SteamOpenIDService:
         params = self._parse_openid_params(openid_url)
         
         # Debug logging
-        print(f"Parsed OpenID params: {list(params.keys())}")
-        print(f"Has claimed_id: {'openid.claimed_id' in params}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Parsed OpenID params: %s", list(params.keys()))
         
         # Steam uses stateless mode, so we verify directly without association
+        # Only positive assertions can be verified; cancel/setup_needed callbacks never need the POST
+        if params.get('openid.mode') != 'id_res':
+            logger.debug("OpenID response is not a positive assertion: %s", params.get('openid.mode'))
+            return None
+        
+        # Assertions from any other provider would fail verification anyway; skip the round trip
+        if params.get('openid.op_endpoint') != self.OPENID_OP_ENDPOINT:
+            logger.debug("OpenID response names a different op_endpoint")
+            return None
+        
         # Check required OpenID parameters
         if 'openid.claimed_id' not in params:
-            print(f"Missing openid.claimed_id in params")
-            return None
-            
-        # Verify the response with Steam
-        if not self._verify_openid_response(params):
-            print(f"OpenID verification failed with Steam")
+            logger.debug("Missing openid.claimed_id in params")
             return None
         
-        # Extract Steam ID from claimed identifier
+        # Extract Steam ID from claimed identifier before asking Steam, so responses
+        # that can't yield a Steam ID are rejected without a network round trip
         # Format: https://steamcommunity.com/openid/id/<STEAM_ID>
         claimed_id = params.get('openid.claimed_id', '')
-        print(f"Claimed ID: {claimed_id}")
-        steam_id_match = re.match(r'https?://steamcommunity\.com/openid/id/(\d+)', claimed_id)
+        logger.debug("Claimed ID: %s", claimed_id)
+        steam_id_match = _STEAM_ID_RE.match(claimed_id)
+        
+        if not steam_id_match:
+            logger.debug("Could not extract Steam ID from claimed_id")
+            return None
         
-        if steam_id_match:
-            steam_id = steam_id_match.group(1)
-            print(f"Extracted Steam ID: {steam_id}")
-            return steam_id
+        # Verify the response with Steam
+        if not self._verify_openid_response(params):
+            logger.debug("OpenID verification failed with Steam")
+            return None
         
-        print(f"Could not extract Steam ID from claimed_id")
-        return None
+        steam_id = steam_id_match.group(1)
+        logger.debug("Extracted Steam ID: %s", steam_id)
+        return steam_id
     
     def _verify_openid_response(self, params: Dict[str, str]) -> bool:
         """
@@ -102,22 +148,31 @@ class SteamOpenIDService:
         verify_params = params.copy()
         verify_params['openid.mode'] = 'check_authentication'
         
-        # Use the correct verification URL from the response
-        verification_url = f'{self.STEAM_OPENID_URL}/login'
+        # Encode the form body once ourselves instead of letting requests re-encode the dict
+        body = urlencode(verify_params).encode('ascii')
+        
+        # Always verify against Steam's endpoint (the response's op_endpoint has been checked to match)
+        verification_url = self.OPENID_OP_ENDPOINT
         
         try:
-            print(f"Verifying with Steam: {verification_url}")
-            response = requests.post(verification_url, data=verify_params, timeout=10)
+            logger.debug("Verifying with Steam: %s", verification_url)
+            response = self._session.post(
+                verification_url,
+                data=body,
+                headers={'Content-Type': 'application/x-www-form-urlencoded'},
+                timeout=10
+            )
             response.raise_for_status()
             
-            # Check if Steam confirms the authentication
-            content = response.text
-            print(f"Steam verification response: {content[:200]}")
-            is_valid = 'is_valid:true' in content
-            print(f"Verification result: {is_valid}")
+            # Check if Steam confirms the authentication; the key-value body is plain ASCII,
+            # so search the raw bytes rather than decoding it first
+            content = response.content
+            logger.debug("Steam verification response: %r", content[:200])
+            is_valid = b'is_valid:true' in content
+            logger.debug("Verification result: %s", is_valid)
             return is_valid
         except Exception as e:
-            print(f"OpenID verification failed: {e}")
+            logger.debug("OpenID verification failed: %s", e)
             return False
     
     def get_steam_user_info(self, steam_id: str) -> Dict[str, Any]:
@@ -130,27 +185,9 @@ class SteamOpenIDService:
         Returns:
             dict: User information including nickname (personaname)
         """
-        url = f'{self.STEAM_API_URL}/ISteamUser/GetPlayerSummaries/v0002/'
-        
-        params = {
-            'key': self.steam_api_key,
-            'steamids': steam_id,
-            'format': 'json'
-        }
-        
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if 'response' in data and 'players' in data['response'] and len(data['response']['players']) > 0:
-            player = data['response']['players'][0]
-            return {
-                'steam_id': steam_id,
-                'nickname': player.get('personaname', f'User{steam_id[-6:]}'),
-                'avatar': player.get('avatarfull', player.get('avatarmedium', player.get('avatar'))),
-                'profile_url': player.get('profileurl')
-            }
+        user_info = self.get_steam_users_info([steam_id]).get(steam_id)
+        if user_info is not None:
+            return user_info
         
         # Fallback if API fails
         return {
@@ -160,23 +197,87 @@ class SteamOpenIDService:
             'profile_url': None
         }
     
+    def get_steam_users_info(self, steam_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve user information for several users from Steam API
+        
+        Cached summaries are reused; the remaining IDs are requested in batches of up to
+        PLAYER_SUMMARIES_BATCH_SIZE per GetPlayerSummaries call.
+        
+        Args:
+            steam_ids: Steam IDs of the users
+            
+        Returns:
+            dict: User information keyed by Steam ID, for every user Steam knows about;
+                  users that couldn't be fetched (unknown, or Steam API unavailable) are left out
+        """
+        cache_keys = {self.PLAYER_SUMMARY_CACHE_KEY.format(steam_id): steam_id for steam_id in steam_ids}
+        users_info = {cache_keys[key]: info for key, info in cache.get_many(cache_keys).items()}
+        missing = [steam_id for steam_id in cache_keys.values() if steam_id not in users_info]
+        
+        fetched = {}
+        
+        for start in range(0, len(missing), self.PLAYER_SUMMARIES_BATCH_SIZE):
+            batch = missing[start:start + self.PLAYER_SUMMARIES_BATCH_SIZE]
+            params = {
+                'key': self.steam_api_key,
+                'steamids': ','.join(batch),
+                'format': 'json'
+            }
+            
+            try:
+                response = self._session.get(self.PLAYER_SUMMARIES_URL, params=params, timeout=self.STEAM_API_TIMEOUT)
+                response.raise_for_status()
+                data = orjson.loads(response.content)
+            except (requests.RequestException, orjson.JSONDecodeError) as e:
+                # Steam is slow or down; leave the rest to the callers' fallbacks instead of failing the login
+                logger.warning("Fetching Steam player summaries failed: %s", e)
+                break
+            
+            requested = set(batch)
+            for player in data.get('response', {}).get('players', []):
+                steam_id = player.get('steamid')
+                if steam_id in requested:
+                    fetched[steam_id] = {
+                        'steam_id': steam_id,
+                        'nickname': player.get('personaname', f'User{steam_id[-6:]}'),
+                        'avatar': next((player[key] for key in self.AVATAR_KEYS if key in player), None),
+                        'profile_url': player.get('profileurl')
+                    }
+        
+        # Only real summaries are cached, so an outage doesn't pin placeholder names
+        if fetched:
+            cache.set_many(
+                {self.PLAYER_SUMMARY_CACHE_KEY.format(steam_id): info for steam_id, info in fetched.items()},
+                timeout=self.PLAYER_SUMMARY_CACHE_TIMEOUT
+            )
+        
+        users_info.update(fetched)
+        return users_info
+    
     def _parse_openid_params(self, url: str) -> Dict[str, str]:
         """
         Parse OpenID parameters from URL
         
+        Only the OpenID 2.0 fields Steam sends are kept, and the number of query
+        fields parsed is capped so oversized callback URLs can't blow up the work.
+        
         Args:
             url: Full URL with query parameters
             
         Returns:
-            dict: Parsed OpenID parameters
+            dict: Parsed OpenID parameters (empty if the query string is oversized)
         """
-        from urllib.parse import urlparse, parse_qs
-        
-        parsed = urlparse(url)
-        params = parse_qs(parsed.query)
+        try:
+            # Blank values are kept: every signed field has to be echoed back verbatim for verification
+            pairs = parse_qsl(
+                urlsplit(url).query, keep_blank_values=True, max_num_fields=self.OPENID_MAX_QUERY_FIELDS
+            )
+        except ValueError:
+            logger.debug("Rejected OpenID callback with too many query fields")
+            return {}
         
-        # Convert lists to single values
-        return {k: v[0] if isinstance(v, list) and len(v) == 1 else v for k, v in params.items()}
+        return {key: value for key, value in pairs if key in self.OPENID_FIELDS}
 
 
 # Singleton instance
@@ -0,0 +1,38 @@
+"""
+Shared helpers for the API compatibility tests
+"""
+
+import time
+import jwt
+from django.conf import settings
+from jwt.algorithms import get_default_algorithms
+
+
+# Shared encoder and HMAC key for test tokens, prepared once instead of on every encode
+_JWT = jwt.PyJWT()
+_JWT_KEY = get_default_algorithms()[settings.JWT_ALGORITHM].prepare_key(settings.JWT_SECRET)
+
+
+def create_token(user, permissions=(), issued_at=None):
+    """Helper to create JWT token with the same claims as api.auth.generate_jwt"""
+    if issued_at is None:
+        issued_at = int(time.time())
+    return _JWT.encode(
+        {
+            'user': {
+                'uid': str(user.uid),
+                'nickname': user.nickname,
+                'steam_id': user.steam_id,
+                'community': None,
+                'active': user.active
+            },
+            'permissions': list(permissions),
+            'iat': issued_at,
+            'exp': issued_at + settings.JWT_EXPIRES_IN,
+            'iss': settings.JWT_ISSUER,
+            'aud': settings.JWT_AUDIENCE,
+            'sub': str(user.uid)
+        },
+        _JWT_KEY,
+        algorithm=settings.JWT_ALGORITHM
+    )
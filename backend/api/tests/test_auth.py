@@ -0,0 +1,169 @@
+"""
+Tests for the JWT helpers in api.auth
+
+Unlike the *_api test modules these exercise the helpers directly instead of going through
+the HTTP endpoints.
+"""
+
+import time
+from types import SimpleNamespace
+from unittest import mock
+from django.test import SimpleTestCase, TestCase
+from api import auth
+from api.auth import (
+    JWT_CACHE_MAX_TTL, PERMISSION_BITS, decode_jwt_cached, generate_jwt, has_permission,
+    permission_bitmap, request_has_permission
+)
+from api.models import User
+
+
+class DecodeJWTCachedTests(TestCase):
+    """Test the per-process cache of decoded JWT payloads"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(nickname='CachedUser', steam_id='76561198000000001')
+
+    def setUp(self):
+        auth._jwt_cache.clear()
+        self.addCleanup(auth._jwt_cache.clear)
+        self.token = generate_jwt(self.user)
+
+    def _decode_counted(self, token):
+        """Decode through the cache and return (payload, whether the token was verified again)"""
+        with mock.patch('api.auth.decode_jwt', wraps=auth.decode_jwt) as decode_jwt:
+            payload = decode_jwt_cached(token)
+        return payload, decode_jwt.called
+
+    def test_cache_hit_skips_verification(self):
+        """A token seen before is answered from the cache"""
+        payload, verified = self._decode_counted(self.token)
+        self.assertTrue(verified)
+        self.assertEqual(payload['sub'], str(self.user.uid))
+
+        cached, verified = self._decode_counted(self.token)
+        self.assertFalse(verified)
+        self.assertEqual(cached, payload)
+
+    def test_entry_expires_after_max_ttl(self):
+        """Long-lived tokens are re-verified once JWT_CACHE_MAX_TTL has passed"""
+        now = time.time()
+        with mock.patch('api.auth.time.time', return_value=now):
+            decode_jwt_cached(self.token)
+
+        with mock.patch('api.auth.time.time', return_value=now + JWT_CACHE_MAX_TTL - 1):
+            self.assertFalse(self._decode_counted(self.token)[1])
+        with mock.patch('api.auth.time.time', return_value=now + JWT_CACHE_MAX_TTL):
+            self.assertTrue(self._decode_counted(self.token)[1])
+
+    def test_entry_expires_with_token(self):
+        """Entries never outlive the token's own exp claim"""
+        now = time.time()
+        with self.settings(JWT_EXPIRES_IN=60):
+            token = generate_jwt(self.user)
+        exp = auth.decode_jwt(token)['exp']
+        self.assertLess(exp, now + JWT_CACHE_MAX_TTL)
+
+        with mock.patch('api.auth.time.time', return_value=now):
+            decode_jwt_cached(token)
+        self.assertEqual(list(auth._jwt_cache.values())[0][1], exp)
+
+        with mock.patch('api.auth.time.time', return_value=exp - 1):
+            self.assertFalse(self._decode_counted(token)[1])
+        with mock.patch('api.auth.time.time', return_value=exp):
+            self.assertTrue(self._decode_counted(token)[1])
+
+    def test_invalid_token_is_not_cached(self):
+        """Tokens failing verification return None and leave no entry behind"""
+        self.assertIsNone(decode_jwt_cached('not-a-jwt'))
+        self.assertIsNone(decode_jwt_cached(self.token[:-2] + 'xx'))
+        self.assertEqual(auth._jwt_cache, {})
+
+    def test_deactivating_user_revokes_cached_tokens(self):
+        """Saving a user as inactive drops their cached tokens"""
+        other = User.objects.create(nickname='Other', steam_id='76561198000000002')
+        other_token = generate_jwt(other)
+        decode_jwt_cached(self.token)
+        decode_jwt_cached(other_token)
+
+        self.user.active = False
+        self.user.save()
+
+        self.assertTrue(self._decode_counted(self.token)[1])
+        self.assertFalse(self._decode_counted(other_token)[1])
+
+    def test_deleting_user_revokes_cached_tokens(self):
+        """Deleting a user drops their cached tokens"""
+        decode_jwt_cached(self.token)
+
+        self.user.delete()
+
+        self.assertEqual(auth._jwt_cache, {})
+
+
+class PermissionBitmapTests(SimpleTestCase):
+    """Test that the perm_bitmap fast path agrees with the permission tree"""
+
+    # Permission lists covering wildcards, superadmin, case variants and prefixes
+    PERMISSION_LISTS = [
+        [],
+        ['*'],
+        ['admin.*'],
+        ['admin.superadmin'],
+        ['Admin.SuperAdmin'],
+        ['admin.user'],
+        ['ADMIN.USER'],
+        ['admin.slotTemplate'],
+        ['admin.slottemplate'],
+        ['admin'],
+        ['admin.users'],
+        ['admin.user.extra'],
+        ['community.test.leader'],
+        ['mission.test.creator', 'admin.mission'],
+        ['admin.community', 'admin.permission'],
+    ]
+
+    def _request(self, permissions, with_bitmap=True):
+        payload = {'permissions': permissions}
+        if with_bitmap:
+            payload['perm_bitmap'] = permission_bitmap(permissions)
+        return SimpleNamespace(auth=payload)
+
+    def test_bitmap_matches_permission_tree(self):
+        """Every bitmap answer equals has_permission on the same list"""
+        for permissions in self.PERMISSION_LISTS:
+            for target in PERMISSION_BITS:
+                with self.subTest(permissions=permissions, target=target):
+                    self.assertEqual(
+                        request_has_permission(self._request(permissions), target),
+                        has_permission(permissions, target)
+                    )
+
+    def test_bitmap_values(self):
+        """Wildcards and superadmin set every bit, near misses set none"""
+        all_bits = sum(PERMISSION_BITS.values())
+
+        self.assertEqual(permission_bitmap(['*']), all_bits)
+        self.assertEqual(permission_bitmap(['Admin.SuperAdmin']), all_bits)
+        self.assertEqual(permission_bitmap(['ADMIN.USER']), PERMISSION_BITS['admin.user'])
+        self.assertEqual(permission_bitmap(['admin.users', 'admin', 'community.test.leader']), 0)
+
+    def test_tokens_without_bitmap_use_permission_tree(self):
+        """Tokens issued before perm_bitmap existed are answered from the permission list"""
+        with mock.patch('api.auth._has_parsed_permission', wraps=auth._has_parsed_permission) as tree_check:
+            self.assertTrue(request_has_permission(self._request(['*'], with_bitmap=False), 'admin.user'))
+        self.assertTrue(tree_check.called)
+
+        for permissions in self.PERMISSION_LISTS:
+            for target in PERMISSION_BITS:
+                with self.subTest(permissions=permissions, target=target):
+                    self.assertEqual(
+                        request_has_permission(self._request(permissions, with_bitmap=False), target),
+                        has_permission(permissions, target)
+                    )
+
+    def test_bitmap_is_used_when_present(self):
+        """With a bitmap the permission list is not consulted for PERMISSION_BITS targets"""
+        request = SimpleNamespace(auth={'permissions': ['*'], 'perm_bitmap': 0})
+
+        self.assertFalse(request_has_permission(request, 'admin.user'))
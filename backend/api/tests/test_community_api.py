@@ -7,28 +7,47 @@ for all community-related endpoints.
 
 from django.test import TestCase, Client
 from api.models import User, Permission, Community, CommunityApplication
+from api.tests.helpers import create_token
 import json
-import jwt
-import time
-from django.conf import settings
 
 
 class CommunityAPICompatibilityTests(TestCase):
     """Test community endpoints for compatibility with legacy API"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-        
+    # Request bodies, serialized once
+    NEW_COMMUNITY_JSON = json.dumps({
+        'name': 'New Community',
+        'tag': 'NC',
+        'slug': 'new-community-slug',
+        'website': 'https://new-community.com'
+    })
+    UNAUTHENTICATED_COMMUNITY_JSON = json.dumps({
+        'name': 'New Community',
+        'tag': 'NC',
+        'slug': 'new-community-2',
+        'website': 'https://new-community.com'
+    })
+    DUPLICATE_COMMUNITY_JSON = json.dumps({
+        'name': 'Duplicate Community',
+        'tag': 'DC',
+        'slug': 'test-community',
+        'website': 'https://duplicate.com'
+    })
+    UPDATE_NAME_JSON = json.dumps({'name': 'Updated Community Name'})
+    UNAUTHORIZED_UPDATE_JSON = json.dumps({'name': 'Unauthorized Update'})
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for the class; each test runs in a rolled back savepoint"""
         # Create test users
-        self.test_user = User.objects.create(
+        cls.test_user = User.objects.create(
             uid='test-user-uid',
             steamId='76561198012345678',
             nickname='TestUser',
             active=True
         )
         
-        self.founder_user = User.objects.create(
+        cls.founder_user = User.objects.create(
             uid='founder-user-uid',
             steamId='76561198087654321',
             nickname='FounderUser',
@@ -36,44 +55,34 @@ class CommunityAPICompatibilityTests(TestCase):
         )
         
         # Create test community
-        self.test_community = Community.objects.create(
+        cls.test_community = Community.objects.create(
             uid='test-community-uid',
             name='Test Community',
             tag='TC',
             slug='test-community',
             website='https://test-community.com',
-            founder=self.founder_user
+            founder=cls.founder_user
         )
         
         # Create founder permission
         Permission.objects.create(
             uid='founder-permission-uid',
-            permission=f'community.{self.test_community.slug}.founder',
-            user=self.founder_user,
-            community=self.test_community
+            permission=f'community.{cls.test_community.slug}.founder',
+            user=cls.founder_user,
+            community=cls.test_community
         )
         
         # Create JWT tokens
-        self.test_token = self._create_token(self.test_user, [])
-        self.founder_token = self._create_token(
-            self.founder_user, 
-            [f'community.{self.test_community.slug}.founder']
+        cls.test_token = create_token(cls.test_user, [])
+        cls.founder_token = create_token(
+            cls.founder_user, 
+            [f'community.{cls.test_community.slug}.founder']
         )
     
-    def _create_token(self, user, permissions):
-        """Helper to create JWT token"""
-        return jwt.encode(
-            {
-                'uid': user.uid,
-                'nickname': user.nickname,
-                'steamId': user.steamId,
-                'permissions': permissions,
-                'iat': int(time.time()),
-                'exp': int(time.time()) + settings.JWT_EXPIRES_IN
-            },
-            settings.JWT_SECRET,
-            algorithm='HS256'
-        )
+    def setUp(self):
+        """Clients that send the fixture users' tokens with every request"""
+        self.user_client = Client(headers={'Authorization': f'Bearer {self.test_token}'})
+        self.founder_client = Client(headers={'Authorization': f'Bearer {self.founder_token}'})
     
     def test_get_community_list_no_auth(self):
         """Test GET /api/v1/communities - Returns paginated community list"""
@@ -140,16 +149,10 @@ class CommunityAPICompatibilityTests(TestCase):
     
     def test_create_community_authenticated(self):
         """Test POST /api/v1/communities - Creates new community"""
-        response = self.client.post(
+        response = self.user_client.post(
             '/api/v1/communities',
-            data=json.dumps({
-                'name': 'New Community',
-                'tag': 'NC',
-                'slug': 'new-community-slug',
-                'website': 'https://new-community.com'
-            }),
-            content_type='application/json',
-            HTTP_AUTHORIZATION=f'Bearer {self.test_token}'
+            data=self.NEW_COMMUNITY_JSON,
+            content_type='application/json'
         )
         
         # Should return 201 Created
@@ -160,20 +163,12 @@ class CommunityAPICompatibilityTests(TestCase):
         self.assertIn('community', data)
         self.assertIn('token', data)
         self.assertEqual(data['community']['slug'], 'new-community-slug')
-        
-        # Cleanup
-        Community.objects.filter(slug='new-community-slug').delete()
     
     def test_create_community_unauthenticated(self):
         """Test POST /api/v1/communities without auth - Should return 401"""
         response = self.client.post(
             '/api/v1/communities',
-            data=json.dumps({
-                'name': 'New Community',
-                'tag': 'NC',
-                'slug': 'new-community-2',
-                'website': 'https://new-community.com'
-            }),
+            data=self.UNAUTHENTICATED_COMMUNITY_JSON,
             content_type='application/json'
         )
         
@@ -182,16 +177,10 @@ class CommunityAPICompatibilityTests(TestCase):
     
     def test_create_community_duplicate_slug(self):
         """Test POST /api/v1/communities with duplicate slug - Should return 409"""
-        response = self.client.post(
+        response = self.user_client.post(
             '/api/v1/communities',
-            data=json.dumps({
-                'name': 'Duplicate Community',
-                'tag': 'DC',
-                'slug': self.test_community.slug,
-                'website': 'https://duplicate.com'
-            }),
-            content_type='application/json',
-            HTTP_AUTHORIZATION=f'Bearer {self.test_token}'
+            data=self.DUPLICATE_COMMUNITY_JSON,
+            content_type='application/json'
         )
         
         # Should return 409 Conflict
@@ -219,11 +208,10 @@ class CommunityAPICompatibilityTests(TestCase):
     
     def test_patch_community_as_founder(self):
         """Test PATCH /api/v1/communities/{communitySlug} - Founder can update community"""
-        response = self.client.patch(
+        response = self.founder_client.patch(
             f'/api/v1/communities/{self.test_community.slug}',
-            data=json.dumps({'name': 'Updated Community Name'}),
-            content_type='application/json',
-            HTTP_AUTHORIZATION=f'Bearer {self.founder_token}'
+            data=self.UPDATE_NAME_JSON,
+            content_type='application/json'
         )
         
         # Should return 200 OK
@@ -240,11 +228,10 @@ class CommunityAPICompatibilityTests(TestCase):
     
     def test_patch_community_as_non_founder(self):
         """Test PATCH /api/v1/communities/{communitySlug} without permission - Should return 403"""
-        response = self.client.patch(
+        response = self.user_client.patch(
             f'/api/v1/communities/{self.test_community.slug}',
-            data=json.dumps({'name': 'Unauthorized Update'}),
-            content_type='application/json',
-            HTTP_AUTHORIZATION=f'Bearer {self.test_token}'
+            data=self.UNAUTHORIZED_UPDATE_JSON,
+            content_type='application/json'
         )
         
         # Should return 403 Forbidden
@@ -269,7 +256,7 @@ class CommunityAPICompatibilityTests(TestCase):
             community=delete_community
         )
         
-        founder_token_delete = self._create_token(
+        founder_token_delete = create_token(
             self.founder_user, 
             [f'community.{delete_community.slug}.founder']
         )
@@ -293,10 +280,7 @@ class CommunityAPICompatibilityTests(TestCase):
     
     def test_delete_community_as_non_founder(self):
         """Test DELETE /api/v1/communities/{communitySlug} without permission - Should return 403"""
-        response = self.client.delete(
-            f'/api/v1/communities/{self.test_community.slug}',
-            HTTP_AUTHORIZATION=f'Bearer {self.test_token}'
-        )
+        response = self.user_client.delete(f'/api/v1/communities/{self.test_community.slug}')
         
         # Should return 403 Forbidden
         self.assertEqual(response.status_code, 403)
@@ -335,10 +319,7 @@ class CommunityAPICompatibilityTests(TestCase):
     
     def test_create_community_application(self):
         """Test POST /api/v1/communities/{communitySlug}/applications - Creates application"""
-        response = self.client.post(
-            f'/api/v1/communities/{self.test_community.slug}/applications',
-            HTTP_AUTHORIZATION=f'Bearer {self.test_token}'
-        )
+        response = self.user_client.post(f'/api/v1/communities/{self.test_community.slug}/applications')
         
         # Should return 200 or 201
         self.assertIn(response.status_code, [200, 201])
@@ -347,27 +328,18 @@ class CommunityAPICompatibilityTests(TestCase):
         data = response.json()
         self.assertIn('status', data)
         self.assertEqual(data['status'], 'submitted')
-        
-        # Cleanup
-        CommunityApplication.objects.filter(
-            user=self.test_user,
-            community=self.test_community
-        ).delete()
     
     def test_get_community_application_status(self):
         """Test GET /api/v1/communities/{communitySlug}/applications/status - Returns application status"""
         # Create an application
-        app = CommunityApplication.objects.create(
+        CommunityApplication.objects.create(
             uid='test-app-uid',
             user=self.test_user,
             community=self.test_community,
             status='submitted'
         )
         
-        response = self.client.get(
-            f'/api/v1/communities/{self.test_community.slug}/applications/status',
-            HTTP_AUTHORIZATION=f'Bearer {self.test_token}'
-        )
+        response = self.user_client.get(f'/api/v1/communities/{self.test_community.slug}/applications/status')
         
         # Should return 200 OK
         self.assertEqual(response.status_code, 200)
@@ -376,6 +348,3 @@ class CommunityAPICompatibilityTests(TestCase):
         data = response.json()
         self.assertIn('application', data)
         self.assertEqual(data['application']['status'], 'submitted')
-        
-        # Cleanup
-        app.delete()
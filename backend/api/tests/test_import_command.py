@@ -1,4 +1,5 @@
 import json
+import requests
 from unittest.mock import patch, Mock
 from django.test import TestCase
 from django.core.management import call_command
@@ -11,15 +12,21 @@ from api.models import Mission, MissionSlotGroup, MissionSlot, Community, User
 class ImportMissionCommandTest(TestCase):
     """Tests for the import_mission management command"""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data"""
         # Create a test creator user
-        self.creator = User.objects.create(
+        cls.creator = User.objects.create(
             nickname='TestCreator',
             steam_id='test_steam_id_123'
         )
+        
+        # API payloads are built once; the import never mutates them
+        cls._MISSION_JSON = cls._get_mock_mission_response()
+        cls._SLOTS_JSON = cls._get_mock_slots_response()
 
-    def _get_mock_mission_response(self):
+    @classmethod
+    def _get_mock_mission_response(cls):
         """Returns mock mission API response"""
         return {
             'mission': {
@@ -60,8 +67,8 @@ class ImportMissionCommandTest(TestCase):
                     'logoUrl': None
                 },
                 'creator': {
-                    'uid': str(self.creator.uid),
-                    'nickname': self.creator.nickname,
+                    'uid': str(cls.creator.uid),
+                    'nickname': cls.creator.nickname,
                     'community': {
                         'uid': 'test-community-uid',
                         'name': 'Test Community',
@@ -74,7 +81,8 @@ class ImportMissionCommandTest(TestCase):
             }
         }
 
-    def _get_mock_slots_response(self):
+    @classmethod
+    def _get_mock_slots_response(cls):
         """Returns mock slots API response"""
         return {
             'slotGroups': [
@@ -99,8 +107,8 @@ class ImportMissionCommandTest(TestCase):
                             'autoAssignable': True,
                             'requiredDLCs': [],
                             'assignee': {
-                                'uid': str(self.creator.uid),
-                                'nickname': self.creator.nickname,
+                                'uid': str(cls.creator.uid),
+                                'nickname': cls.creator.nickname,
                                 'community': None
                             },
                             'externalAssignee': None,
@@ -129,19 +137,22 @@ class ImportMissionCommandTest(TestCase):
             ]
         }
 
-    @patch('api.management.commands.import_mission.requests.get')
-    def test_dry_run(self, mock_get):
-        """Test dry run doesn't save anything"""
-        # Setup mocks
+    def _mock_pair(self):
+        """Returns the mission and slots API responses, in request order"""
         mission_response = Mock()
-        mission_response.json.return_value = self._get_mock_mission_response()
+        mission_response.json.return_value = self._MISSION_JSON
         mission_response.raise_for_status = Mock()
         
         slots_response = Mock()
-        slots_response.json.return_value = self._get_mock_slots_response()
+        slots_response.json.return_value = self._SLOTS_JSON
         slots_response.raise_for_status = Mock()
         
-        mock_get.side_effect = [mission_response, slots_response]
+        return [mission_response, slots_response]
+
+    @patch('api.import_utils._session.get')
+    def test_dry_run(self, mock_get):
+        """Test dry run doesn't save anything"""
+        mock_get.side_effect = self._mock_pair()
         
         # Run command with dry-run
         out = StringIO()
@@ -158,19 +169,10 @@ class ImportMissionCommandTest(TestCase):
         self.assertIn('Test Mission', output)
         self.assertIn('Team Leader', output)
 
-    @patch('api.management.commands.import_mission.requests.get')
+    @patch('api.import_utils._session.get')
     def test_import_mission_success(self, mock_get):
         """Test successful mission import"""
-        # Setup mocks
-        mission_response = Mock()
-        mission_response.json.return_value = self._get_mock_mission_response()
-        mission_response.raise_for_status = Mock()
-        
-        slots_response = Mock()
-        slots_response.json.return_value = self._get_mock_slots_response()
-        slots_response.raise_for_status = Mock()
-        
-        mock_get.side_effect = [mission_response, slots_response]
+        mock_get.side_effect = self._mock_pair()
         
         # Run command
         out = StringIO()
@@ -199,7 +201,7 @@ class ImportMissionCommandTest(TestCase):
         output = out.getvalue()
         self.assertIn('Successfully imported', output)
 
-    @patch('api.management.commands.import_mission.requests.get')
+    @patch('api.import_utils._session.get')
     def test_mission_already_exists(self, mock_get):
         """Test error when mission already exists"""
         # Create existing mission
@@ -218,16 +220,7 @@ class ImportMissionCommandTest(TestCase):
             community=community
         )
         
-        # Setup mocks
-        mission_response = Mock()
-        mission_response.json.return_value = self._get_mock_mission_response()
-        mission_response.raise_for_status = Mock()
-        
-        slots_response = Mock()
-        slots_response.json.return_value = self._get_mock_slots_response()
-        slots_response.raise_for_status = Mock()
-        
-        mock_get.side_effect = [mission_response, slots_response]
+        mock_get.side_effect = self._mock_pair()
         
         # Attempt to import should fail
         with self.assertRaises(CommandError) as context:
@@ -235,11 +228,11 @@ class ImportMissionCommandTest(TestCase):
         
         self.assertIn('already exists', str(context.exception))
 
-    @patch('api.management.commands.import_mission.requests.get')
+    @patch('api.import_utils._session.get')
     def test_network_error(self, mock_get):
         """Test error handling for network failures"""
         # Setup mock to raise exception
-        mock_get.side_effect = Exception('Network error')
+        mock_get.side_effect = requests.ConnectionError('Network error')
         
         # Attempt to import should fail gracefully
         with self.assertRaises(CommandError) as context:
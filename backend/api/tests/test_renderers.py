@@ -0,0 +1,56 @@
+"""
+Tests for the orjson-backed response rendering
+
+Every endpoint's JSON goes through ORJSONRenderer (directly or via json_response), so its
+output has to match the stock Ninja/Django encoder byte for byte where clients can tell.
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from django.test import SimpleTestCase
+from ninja.responses import NinjaJSONEncoder
+from api.renderers import ORJSONRenderer, json_response
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    """Test that the orjson renderer keeps the legacy JSON format"""
+
+    def setUp(self):
+        self.renderer = ORJSONRenderer()
+
+    def _render(self, data):
+        return json.loads(self.renderer.render(None, data, response_status=200))
+
+    def test_aware_datetime_uses_milliseconds_and_z(self):
+        """Aware UTC datetimes are rendered with millisecond precision and a Z suffix"""
+        value = datetime(2026, 10, 16, 3, 34, 30, 880123, tzinfo=dt_timezone.utc)
+
+        self.assertEqual(self._render({'createdAt': value})['createdAt'], '2026-10-16T03:34:30.880Z')
+
+    def test_naive_datetime_has_no_timezone_suffix(self):
+        """Naive datetimes are rendered without a timezone, like DjangoJSONEncoder does"""
+        value = datetime(2026, 10, 16, 3, 34, 30, 880123)
+
+        self.assertEqual(self._render({'createdAt': value})['createdAt'], '2026-10-16T03:34:30.880')
+
+    def test_output_matches_stock_encoder(self):
+        """Datetimes, UUIDs and nested containers render exactly like NinjaJSONEncoder"""
+        data = {
+            'uid': uuid.UUID('123e4567-e89b-12d3-a456-426614174000'),
+            'startTime': datetime(2026, 10, 16, 18, 0, tzinfo=dt_timezone.utc),
+            'endTime': None,
+            'slots': [{'orderNumber': 1, 'updatedAt': datetime(2026, 1, 2, 3, 4, 5, 6000, tzinfo=dt_timezone.utc)}],
+        }
+
+        self.assertEqual(self._render(data), json.loads(json.dumps(data, cls=NinjaJSONEncoder)))
+
+    def test_json_response_uses_renderer_format(self):
+        """json_response renders datetimes the same way"""
+        value = datetime(2026, 10, 16, 3, 34, 30, 880123, tzinfo=dt_timezone.utc)
+
+        response = json_response({'createdAt': value}, status=201)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content)['createdAt'], '2026-10-16T03:34:30.880Z')
@@ -7,66 +7,57 @@ for all user-related endpoints.
 
 from django.test import TestCase, Client
 from api.models import User, Permission, Community
+from api.tests.helpers import create_token
 import json
-import jwt
 import time
-from django.conf import settings
 
 
 class UserAPICompatibilityTests(TestCase):
     """Test user endpoints for compatibility with legacy API"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-        
-        # Create test users
-        self.test_user1 = User.objects.create(
-            uid='test-user-uid-1',
-            steamId='76561198012345678',
-            nickname='TestUser1',
-            active=True
-        )
-        
-        self.test_user2 = User.objects.create(
-            uid='test-user-uid-2',
-            steamId='76561198087654321',
-            nickname='TestUser2',
-            active=True
-        )
-        
-        self.admin_user = User.objects.create(
-            uid='admin-user-uid',
-            steamId='76561198011111111',
-            nickname='AdminUser',
-            active=True
-        )
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for the class; each test runs in a rolled back savepoint"""
+        # Create test users in one INSERT
+        cls.test_user1, cls.test_user2, cls.admin_user, cls.delete_user = User.objects.bulk_create([
+            User(
+                steam_id='76561198012345678',
+                nickname='TestUser1',
+                active=True
+            ),
+            User(
+                steam_id='76561198087654321',
+                nickname='TestUser2',
+                active=True
+            ),
+            User(
+                steam_id='76561198011111111',
+                nickname='AdminUser',
+                active=True
+            ),
+            User(
+                steam_id='76561198099999999',
+                nickname='DeleteUser2',
+                active=True
+            ),
+        ])
         
         # Create admin permission
-        Permission.objects.create(
-            uid='admin-permission-uid',
-            permission='admin.user',
-            user=self.admin_user
-        )
-        
-        # Create JWT tokens
-        self.test_token = self._create_token(self.test_user1, [])
-        self.admin_token = self._create_token(self.admin_user, ['admin.user'])
+        Permission.objects.bulk_create([
+            Permission(
+                permission='admin.user',
+                user=cls.admin_user
+            ),
+        ])
+        
+        # Create JWT tokens, all issued at the same instant
+        issued_at = int(time.time())
+        cls.test_token = create_token(cls.test_user1, [], issued_at)
+        cls.admin_token = create_token(cls.admin_user, ['admin.user'], issued_at)
     
-    def _create_token(self, user, permissions):
-        """Helper to create JWT token"""
-        return jwt.encode(
-            {
-                'uid': user.uid,
-                'nickname': user.nickname,
-                'steamId': user.steamId,
-                'permissions': permissions,
-                'iat': int(time.time()),
-                'exp': int(time.time()) + settings.JWT_EXPIRES_IN
-            },
-            settings.JWT_SECRET,
-            algorithm='HS256'
-        )
+    def setUp(self):
+        """Set up per-test state"""
+        self.client = Client()
     
     def test_get_user_list_no_auth(self):
         """Test GET /api/v1/users - Returns paginated user list without auth"""
@@ -126,7 +117,7 @@ class UserAPICompatibilityTests(TestCase):
         # Response should contain user details
         data = response.json()
         self.assertIn('user', data)
-        self.assertEqual(data['user']['uid'], self.test_user1.uid)
+        self.assertEqual(data['user']['uid'], str(self.test_user1.uid))
         self.assertEqual(data['user']['nickname'], self.test_user1.nickname)
     
     def test_get_user_details_not_found(self):
@@ -184,20 +175,10 @@ class UserAPICompatibilityTests(TestCase):
         # Verify in database
         self.test_user1.refresh_from_db()
         self.assertFalse(self.test_user1.active)
-        
-        # Reactivate for cleanup
-        self.test_user1.active = True
-        self.test_user1.save()
     
     def test_delete_user_as_admin(self):
         """Test DELETE /api/v1/users/{userUid} - Admin can delete user"""
-        # Create a user to delete
-        delete_user = User.objects.create(
-            uid='delete-user-uid-2',
-            steamId='76561198099999999',
-            nickname='DeleteUser2',
-            active=True
-        )
+        delete_user = self.delete_user
         
         response = self.client.delete(
             f'/api/v1/users/{delete_user.uid}',
@@ -10,7 +10,19 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'slotlist_backend.settings')
 
 application = get_wsgi_application()
+
+
+def _warm_up():
+    """
+    Load the URLconf (and with it the API routers and their schemas) while the worker boots,
+    so the first request it serves doesn't pay for the import.
+    """
+    get_resolver().url_patterns  # force URLconf import at worker boot
+
+
+_warm_up()